@@ -0,0 +1,250 @@
+"""Benchmarks for scanning, tree building and profile I/O on synthetic spaces.
+
+Usage:
+```bash
+uv run python benchmarks/bench.py --depth 3 --fanout 8 --files 4 -o after.json
+uv run python benchmarks/bench.py --compare before.json after.json
+```
+
+A synthetic omoospace is generated in a temporary directory. Each directory
+level has `fanout` subspace directories, each with `files` subspace files,
+plus ignored and content files. Every benchmark is run `repeat` times and the
+timings are written as JSON, with the commit and parameters they ran with.
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from omoospace import Omoospace, create_omoospace, normalize_name, normalize_names
+from omoospace import common, utils, omoospace as omoospace_module
+
+
+def make_space(
+    under: Path,
+    depth: int = 3,
+    fanout: int = 6,
+    files: int = 3,
+    ignored: int = 1,
+    makers: int = 50,
+) -> Omoospace:
+    """Generate a synthetic omoospace.
+
+    Args:
+        under (Path): Directory to create the omoospace in.
+        depth (int, optional): Levels of subspace directories. Defaults to 3.
+        fanout (int, optional): Subspace directories in each directory.
+            Defaults to 6.
+        files (int, optional): Subspace files in each directory. Defaults to 3.
+        ignored (int, optional): Ignored files in each directory, matched by
+            the ignore rules. Defaults to 1.
+        makers (int, optional): Makers in the profile. Defaults to 50.
+
+    Returns:
+        Omoospace: The generated omoospace.
+    """
+    omoospace = create_omoospace("BenchProject", under=under)
+    omoospace.set("ignore", ["**/*.bak", "**/Cache/"])
+
+    def fill(dirpath: Path, names: list[str], level: int):
+        dirpath.mkdir(parents=True, exist_ok=True)
+        stem = "_".join(names) if names else "Root"
+        for i in range(files):
+            (dirpath / f"{stem}_Task{i:02}.v001.blend").touch()
+        for i in range(ignored):
+            (dirpath / f"{stem}_{i:02}.bak").touch()
+        (dirpath / "Cache").mkdir(exist_ok=True)
+        (dirpath / "Cache" / "cache.bin").touch()
+        if level >= depth:
+            return
+        for i in range(fanout):
+            name = f"L{level}N{i:02}"
+            fill(dirpath / name, [*names, name], level + 1)
+
+    fill(omoospace.subspaces_dir, [], 0)
+
+    for i in range(fanout * files):
+        (omoospace.contents_dir / f"Content{i:03}.glb").touch()
+
+    omoospace.add_makers(
+        {"name": f"Maker{i:03}", "email": f"maker{i:03}@example.com"}
+        for i in range(makers)
+    )
+    return omoospace
+
+
+def clear_caches():
+    """Forget everything cached in the process, like a new process would."""
+    common._profile_cache.clear()
+    omoospace_module._root_cache.clear()
+    omoospace_module._tree_cache.clear()
+    omoospace_module._clip_names.cache_clear()
+    utils._normalize_name.cache_clear()
+
+
+def measure(
+    func: Callable[[], object], repeat: int, setup: Optional[Callable] = None
+) -> dict:
+    """Time a function, with setup run before each run and not timed."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "runs": repeat,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    under = Path(tempfile.mkdtemp(prefix="omoospace-bench-"))
+    try:
+        omoospace = make_space(
+            under,
+            depth=args.depth,
+            fanout=args.fanout,
+            files=args.files,
+            ignored=args.ignored,
+            makers=args.makers,
+        )
+        root = omoospace.root_dir
+        subspaces = list(omoospace.iter_subspaces())
+        sample = subspaces[len(subspaces) // 2]
+        names = [s.stem for s in subspaces]
+        contents = sorted(p.name for p in omoospace.contents_dir.iterdir())
+
+        def add_work():
+            Omoospace(root).add_work(*contents[:2])
+
+        def add_remove_makers():
+            omoospace = Omoospace(root)
+            added = omoospace.add_makers(
+                {"name": f"Extra{i:03}", "email": f"extra{i:03}@example.com"}
+                for i in range(args.makers)
+            )
+            omoospace.remove_makers(added)
+
+        def normalize_all():
+            for name in names:
+                normalize_name(name)
+
+        benchmarks = {
+            "subspaces.cold": (lambda: Omoospace(root).subspaces, clear_caches),
+            "subspaces.warm": (lambda: Omoospace(root).subspaces, None),
+            "objective_tree.cold": (
+                lambda: Omoospace(root).objective_tree,
+                clear_caches,
+            ),
+            "objective_tree.warm": (lambda: Omoospace(root).objective_tree, None),
+            "extract_objective.cold": (
+                lambda: Omoospace.extract_objective(sample),
+                clear_caches,
+            ),
+            "extract_objective.warm": (
+                lambda: Omoospace.extract_objective(sample),
+                None,
+            ),
+            "add_work": (add_work, None),
+            "makers": (lambda: list(Omoospace(root).makers), None),
+            "makers.cold": (lambda: list(Omoospace(root).makers), clear_caches),
+            "add_remove_makers": (add_remove_makers, None),
+            "normalize_name.cold": (normalize_all, clear_caches),
+            "normalize_name.warm": (normalize_all, None),
+            "normalize_names": (lambda: normalize_names(names), clear_caches),
+        }
+
+        results = {}
+        for name, (func, setup) in benchmarks.items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(func, args.repeat, setup)
+            print(f"{name:<26}{results[name]['median'] * 1000:>10.2f} ms")
+
+        return {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "depth": args.depth,
+                "fanout": args.fanout,
+                "files": args.files,
+                "ignored": args.ignored,
+                "makers": args.makers,
+                "subspaces": len(subspaces),
+            },
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(under, ignore_errors=True)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.strip()
+
+
+def compare(before_file: str, after_file: str):
+    """Print the median timings of two result files side by side."""
+    before = json.loads(Path(before_file).read_text())
+    after = json.loads(Path(after_file).read_text())
+    print(f"{'':<26}{before['commit'] or 'before':>12}{after['commit'] or 'after':>12}")
+    for name, result in after["results"].items():
+        old = before["results"].get(name)
+        new_ms = result["median"] * 1000
+        if old is None:
+            print(f"{name:<26}{'-':>12}{new_ms:>10.2f}ms")
+            continue
+        old_ms = old["median"] * 1000
+        ratio = old_ms / new_ms if new_ms else float("inf")
+        print(f"{name:<26}{old_ms:>10.2f}ms{new_ms:>10.2f}ms{ratio:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--files", type=int, default=3)
+    parser.add_argument("--ignored", type=int, default=1)
+    parser.add_argument("--makers", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="Only run benchmarks containing this")
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two results"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,9 @@ __all__ = [
     "make_path",
     "copy_to_clipboard",
     "normalize_name",
+    "normalize_names",
     "is_ignore",
+    "IgnoreMatcher",
     "is_recovered",
     "is_buckup",
     "is_autosave",
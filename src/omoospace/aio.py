@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Optional
+
+from omoospace.language import Language
+from omoospace.omoospace import Objective, ObjectiveTree, Omoospace, Subspace
+from omoospace.utils import AnyPath, Opath, Oset
+
+
+class AsyncOmoospace:
+    """Asyncio facade of an Omoospace.
+
+    Every call doing disk I/O runs in a worker thread, so the event loop is
+    never blocked. Discovery is streamed, subspaces are handed to the loop in
+    batches while the walk goes on.
+
+    All the calls can run concurrently. Profile writes (`set`) take the
+    profile lock, and the shared objective tree is only read and patched
+    holding the lock of that tree (`objective_tree`, `extract_objective`,
+    `add_subspace`), the trees of other omoospaces are not held up. The
+    tree returned by `objective_tree` is shared, read it while no
+    `add_subspace` is running, or get it again after.
+
+    Usage:
+    ```python
+    omoospace = await AsyncOmoospace.open("path/to/omoospace")
+    async for subspace in omoospace.iter_subspaces():
+        print(subspace)
+    ```
+    """
+
+    def __init__(self, omoospace: Omoospace):
+        """Initialize from an opened omoospace, see `AsyncOmoospace.open`.
+
+        Args:
+            omoospace (Omoospace): The omoospace.
+        """
+        self.omoospace = omoospace
+
+    @classmethod
+    async def open(
+        cls, detect_dir: AnyPath, language: Language = None
+    ) -> "AsyncOmoospace":
+        """Open an existing omoospace, see `Omoospace`.
+
+        Args:
+            detect_dir (AnyPath): A path in the omoospace.
+            language (Language, optional): Profile language. Defaults to None.
+
+        Returns:
+            AsyncOmoospace: The opened omoospace.
+        """
+        omoospace = await asyncio.to_thread(Omoospace, detect_dir, language)
+        return cls(omoospace)
+
+    @property
+    def root_dir(self) -> Opath:
+        """Opath: Omoospace root directory."""
+        return self.omoospace.root_dir
+
+    async def get(self, key: str) -> Any:
+        """Get the value for the given key in the profile file."""
+        return await asyncio.to_thread(self.omoospace.get, key)
+
+    async def set(self, key: str, value: Any):
+        """Set the value for the given key in the profile file."""
+        await asyncio.to_thread(self.omoospace.set, key, value)
+
+    async def subspaces(self) -> Oset[Subspace]:
+        """Get the subspaces in the subspaces directory.
+
+        Returns:
+            Oset[Subspace]: The subspaces.
+        """
+        return await asyncio.to_thread(lambda: self.omoospace.subspaces)
+
+    async def iter_subspaces(self, batch_size: int = 64) -> AsyncIterator[Subspace]:
+        """Discover the subspaces, as they are found by a walk in a thread.
+
+        Args:
+            batch_size (int, optional): Subspaces handed to the event loop at
+                once. Defaults to 64.
+
+        Yields:
+            Subspace: The subspaces.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # The event loop is closed, nobody is waiting.
+                stop.set()
+
+        def walk():
+            batch = []
+            try:
+                for subspace in self.omoospace.iter_subspaces():
+                    if stop.is_set():
+                        return
+                    batch.append(subspace)
+                    if len(batch) >= batch_size:
+                        put(batch)
+                        batch = []
+                if batch:
+                    put(batch)
+            except Exception as err:
+                put(err)
+            finally:
+                put(None)
+
+        walking = loop.run_in_executor(None, walk)
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                for subspace in batch:
+                    yield subspace
+        finally:
+            stop.set()
+            await asyncio.wait([walking])
+
+    async def objective_tree(self) -> ObjectiveTree:
+        """Get the objective tree, built or validated in a thread.
+
+        Returns:
+            ObjectiveTree: The objective tree.
+        """
+        return await asyncio.to_thread(lambda: self.omoospace.objective_tree)
+
+    async def extract_objective(self, path: AnyPath) -> Optional[Objective]:
+        """Get objective by subspace, see `Omoospace.extract_objective`."""
+        return await asyncio.to_thread(Omoospace.extract_objective, path)
+
+    async def add_subspace(
+        self, name: str, under: str = None, collect_children: bool = True
+    ) -> Subspace:
+        """Add a subspace, see `Omoospace.add_subspace`.
+
+        Returns:
+            Subspace: The added subspace.
+        """
+        return await asyncio.to_thread(
+            self.omoospace.add_subspace,
+            name,
+            under=under,
+            collect_children=collect_children,
+        )
@@ -1,10 +1,10 @@
-import typer
 from pathlib import Path
-from InquirerPy import inquirer
+from typing import Optional
+
+import typer
 
 from omoospace.functions import create_omoospace
 from omoospace.omoospace import Omoospace
-from omoospace.common import yaml
 from omoospace.utils import Opath, normalize_name
 
 # 主应用
@@ -21,15 +21,64 @@ def detect_omoospace_or_exit():
     try:
         return Omoospace(Path.cwd())
     except Exception as err:
-        typer.secho(f"Error: {e}", fg=typer.colors.RED)
+        typer.secho(f"Error: {err}", fg=typer.colors.RED)
         raise typer.Exit(1)
 
 
+# InquirerPy is slow to import, it's only imported when a prompt is shown.
+# Options given on the command line are never prompted, and with --yes the
+# defaults are used for the rest.
+def ask_text(message: str, value: Optional[str], default: str = "", yes=False):
+    if value is not None:
+        return value
+    if yes:
+        return default
+
+    from InquirerPy import inquirer
+
+    return inquirer.text(message=message, default=default).execute()
+
+
+def ask_confirm(message: str, value: Optional[bool], default: bool, yes=False):
+    if value is not None:
+        return value
+    if yes:
+        return default
+
+    from InquirerPy import inquirer
+
+    return inquirer.confirm(message=message, default=default).execute()
+
+
+def ask_select(message: str, choices: list[str], default: str, yes=False):
+    if yes:
+        return default
+
+    from InquirerPy import inquirer
+
+    return inquirer.select(message=message, choices=choices, default=default).execute()
+
+
+YesOption = typer.Option(False, "--yes", "-y", help="Use defaults, never prompt")
+BriefOption = typer.Option(None, "--brief", help="Brief description")
+RevealOption = typer.Option(
+    None, help="Reveal in file explorer, defaults to not with --yes"
+)
+
+
 # -------------------------- 全局命令 --------------------------
 
 
 @app.command()
-def init():
+def init(
+    brief: Optional[str] = BriefOption,
+    contents: Optional[str] = typer.Option(None, help="Contents folder"),
+    subspaces: Optional[str] = typer.Option(None, help="Subspaces folder"),
+    pinyin: Optional[bool] = typer.Option(None, help="Convert Chinese to pinyin"),
+    readme: Optional[bool] = typer.Option(None, help="Add README.md"),
+    reveal: Optional[bool] = RevealOption,
+    yes: bool = YesOption,
+):
     """
     Initialize current directory as an Omoospace.
     """
@@ -86,36 +135,41 @@ def init():
     )
 
     # 4. Select or create logic (single step, English, skip if exact match)
-    def select_or_create(folder_type, candidates, default):
+    def select_or_create(folder_type, value, candidates, default):
+        if value is not None:
+            return value
         # If exact match exists, use it directly
         if default in candidates:
             return default
         # If there are candidates, ask user to select or create new
         if candidates:
             choices = candidates + [f"Create new '{folder_type}'"]
-            selected = inquirer.select(
-                message=f"Select as {folder_type}, or create new:",
+            selected = ask_select(
+                f"Select as {folder_type}, or create new:",
                 choices=choices,
                 default=choices[0],
-            ).execute()
+                yes=yes,
+            )
 
             if not selected.startswith("Create new"):
                 return selected
 
-        return inquirer.text(message=f"{folder_type}:", default=default).execute()
+        return ask_text(f"{folder_type}:", None, default=default, yes=yes)
 
-    brief = inquirer.text(message="Brief:", default="").execute()
+    brief = ask_text("Brief:", brief, yes=yes)
 
-    contents_dir = select_or_create("Contents Folder", contents_candidates, "Contents")
+    contents_dir = select_or_create(
+        "Contents Folder", contents, contents_candidates, "Contents"
+    )
     subspaces_dir = select_or_create(
-        "Subspaces Folder", subspaces_candidates, "Subspaces"
+        "Subspaces Folder", subspaces, subspaces_candidates, "Subspaces"
     )
 
-    chinese_to_pinyin = inquirer.confirm(
-        message="Convert Chinese to pinyin?", default=False
-    ).execute()
+    chinese_to_pinyin = ask_confirm(
+        "Convert Chinese to pinyin?", pinyin, default=False, yes=yes
+    )
 
-    readme = inquirer.confirm(message="Add README.md?", default=True).execute()
+    readme = ask_confirm("Add README.md?", readme, default=True, yes=yes)
 
     omoospace = create_omoospace(
         name=cwd.name,
@@ -125,36 +179,45 @@ def init():
         contents_dir=contents_dir,
         subspaces_dir=subspaces_dir,
         readme=readme,
-        reveal_in_explorer=True,
+        reveal_in_explorer=not yes if reveal is None else reveal,
     )
     typer.secho(f"Omoospace created: {omoospace.root_dir}", fg=typer.colors.GREEN)
 
 
 @app.command()
-def create(name: str = typer.Argument(..., help="Omoospace name")):
+def create(
+    name: str = typer.Argument(..., help="Omoospace name"),
+    under: str = typer.Option(".", help="Parent directory"),
+    brief: Optional[str] = BriefOption,
+    contents: Optional[str] = typer.Option(None, help="Contents folder"),
+    subspaces: Optional[str] = typer.Option(None, help="Subspaces folder"),
+    pinyin: Optional[bool] = typer.Option(None, help="Convert Chinese to pinyin"),
+    readme: Optional[bool] = typer.Option(None, help="Add README.md"),
+    reveal: Optional[bool] = RevealOption,
+    yes: bool = YesOption,
+):
     """Create a new omoospace."""
-    brief = inquirer.text(message="Brief:", default="").execute()
+    brief = ask_text("Brief:", brief, yes=yes)
 
-    contents_dir = inquirer.text(
-        message="Contents Folder:", default="Contents"
-    ).execute()
-    subspaces_dir = inquirer.text(
-        message="Subspaces Folder:", default="Subspaces"
-    ).execute()
+    contents_dir = ask_text("Contents Folder:", contents, default="Contents", yes=yes)
+    subspaces_dir = ask_text(
+        "Subspaces Folder:", subspaces, default="Subspaces", yes=yes
+    )
 
-    chinese_to_pinyin = inquirer.confirm(
-        message="Convert Chinese to pinyin?", default=False
-    ).execute()
-    readme = inquirer.confirm(message="Add README.md?", default=True).execute()
+    chinese_to_pinyin = ask_confirm(
+        "Convert Chinese to pinyin?", pinyin, default=False, yes=yes
+    )
+    readme = ask_confirm("Add README.md?", readme, default=True, yes=yes)
 
     omoospace = create_omoospace(
         name=name,
         brief=brief,
+        under=under,
         contents_dir=contents_dir,
         subspaces_dir=subspaces_dir,
         chinese_to_pinyin=chinese_to_pinyin,
         readme=readme,
-        reveal_in_explorer=True,
+        reveal_in_explorer=not yes if reveal is None else reveal,
     )
     typer.secho(f"Omoospace created: {omoospace.root_dir}", fg=typer.colors.GREEN)
 
@@ -169,30 +232,114 @@ def tree():
         typer.secho(f"Print tree failed: {err}", fg=typer.colors.RED)
 
 
+@app.command()
+def index(remove: bool = typer.Option(False, "--remove", help="Remove the index")):
+    """Create or update the subspace index, to open this omoospace faster"""
+    omoospace = detect_omoospace_or_exit()
+    if remove:
+        omoospace.remove_index()
+        typer.secho("Index removed", fg=typer.colors.GREEN)
+        return
+
+    omoospace.create_index()
+    index_dir = omoospace.root_dir / ".omoospace"
+    typer.secho(f"Index created: {index_dir}", fg=typer.colors.GREEN)
+
+
+@app.command()
+def shard(
+    merge: bool = typer.Option(False, "--merge", help="Merge back into one file"),
+):
+    """Split the makers, tools, works and notes into their own profile files"""
+    omoospace = detect_omoospace_or_exit()
+    if merge:
+        omoospace.merge_profile()
+        typer.secho(f"Profile merged: {omoospace.profile_file}", fg=typer.colors.GREEN)
+        return
+
+    omoospace.split_profile()
+    typer.secho(f"Profile split: {omoospace.shards_dir}", fg=typer.colors.GREEN)
+
+
+@app.command()
+def journal(
+    remove: bool = typer.Option(False, "--remove", help="Compact and stop journaling"),
+):
+    """Journal profile changes instead of rewriting the profile"""
+    omoospace = detect_omoospace_or_exit()
+    if remove:
+        omoospace.remove_journal()
+        typer.secho("Journal removed", fg=typer.colors.GREEN)
+        return
+
+    omoospace.create_journal()
+    typer.secho(f"Journal created: {omoospace.journal_file}", fg=typer.colors.GREEN)
+
+
+@app.command()
+def compact():
+    """Fold the profile journal into the profile"""
+    omoospace = detect_omoospace_or_exit()
+    omoospace.compact()
+    typer.secho(f"Profile compacted: {omoospace.profile_file}", fg=typer.colors.GREEN)
+
+
+@app.command()
+def watch(
+    interval: float = typer.Option(1.0, help="Seconds between polls"),
+):
+    """Watch subspaces and objectives, and print the changes"""
+    omoospace = detect_omoospace_or_exit()
+    typer.secho(f"Watching {omoospace.subspaces_dir}", fg=typer.colors.BLUE)
+    colors = {
+        "added": typer.colors.GREEN,
+        "removed": typer.colors.RED,
+        "renamed": typer.colors.YELLOW,
+    }
+    try:
+        with omoospace.watch(interval=interval) as watcher:
+            for event in watcher:
+                typer.secho(str(event), fg=colors[event.type.value])
+    except KeyboardInterrupt:
+        pass
+
+
 # -------------------------- Subspace 命令 --------------------------
 @subspace_app.command("add")
-def add_subspace(name: str = typer.Argument(..., help="Subspace name")):
+def add_subspace(
+    name: str = typer.Argument(..., help="Subspace name"),
+    under: Optional[str] = typer.Option(
+        None, help="Directory relative to the subspaces folder"
+    ),
+    collect: Optional[bool] = typer.Option(
+        None, help="Auto collect related subspaces"
+    ),
+    reveal: Optional[bool] = RevealOption,
+    yes: bool = YesOption,
+):
     """Add a new subspace"""
     omoospace = detect_omoospace_or_exit()
     subspaces_dir = omoospace.subspaces_dir
-    subdirs = [p for p in subspaces_dir.glob("**/") if p.is_dir()]
-    subdirs = [str(p.relative_to(subspaces_dir)) for p in subdirs]
-    if not subdirs:
-        subdirs = ["."]
-    parent_dir = inquirer.select(
-        message="Under which directory:",
-        choices=subdirs,
-        default=".",
-    ).execute()
-    collect_children = inquirer.confirm(
-        message="Auto collect related subspaces?", default=True
-    ).execute()
+    parent_dir = under
+    if parent_dir is None:
+        parent_dir = "."
+        if not yes:
+            subdirs = [p for p in subspaces_dir.glob("**/") if p.is_dir()]
+            subdirs = [str(p.relative_to(subspaces_dir)) for p in subdirs]
+            if not subdirs:
+                subdirs = ["."]
+            parent_dir = ask_select(
+                "Under which directory:", choices=subdirs, default="."
+            )
+    collect_children = ask_confirm(
+        "Auto collect related subspaces?", collect, default=True, yes=yes
+    )
     try:
         subs = omoospace.add_subspace(
             name=name,
             under=str(subspaces_dir / parent_dir) if parent_dir != "." else None,
             collect_children=collect_children,
-            reveal_in_explorer=True,
+            reveal_in_explorer=not yes if reveal is None else reveal,
         )
         typer.secho(f"Subspace {subs.pathname} added", fg=typer.colors.GREEN)
     except Exception as err:
@@ -202,7 +349,11 @@ def add_subspace(name: str = typer.Argument(..., help="Subspace name")):
 # -------------------------- Work 命令 --------------------------
 @work_app.command("add")
 def add_work(
-    items: list[str] = typer.Argument(..., help="Content path(s) to Contents folder")
+    items: list[str] = typer.Argument(..., help="Content path(s) to Contents folder"),
+    name: Optional[str] = typer.Option(None, help="Work name"),
+    brief: Optional[str] = BriefOption,
+    version: str = typer.Option("0.1.0", help="Work version"),
+    yes: bool = YesOption,
 ):
     """Add a new work"""
     omoospace = detect_omoospace_or_exit()
@@ -221,11 +372,11 @@ def add_work(
         content = str(abs_path.relative_to(omoospace.contents_dir)) if is_abs else item
         contents.append(content)
 
-    name = inquirer.text(message="Name:", default="").execute()
-    brief = inquirer.text(message="Brief:", default="").execute()
+    name = ask_text("Name:", name, yes=yes)
+    brief = ask_text("Brief:", brief, yes=yes)
     name = name or contents[0].split("/")[-1].split(".")[0]
 
-    work = {"name": name, "version": "0.1.0", "contents": contents}
+    work = {"name": name, "version": version, "contents": contents}
     if brief:
         work["brief"] = brief
 
@@ -257,12 +408,17 @@ def list_work():
 
 # -------------------------- tool 命令 --------------------------
 @tool_app.command("add")
-def add_tool(name: str = typer.Argument(..., help="tool name")):
+def add_tool(
+    name: str = typer.Argument(..., help="tool name"),
+    version: Optional[str] = typer.Option(None, help="Tool version"),
+    website: Optional[str] = typer.Option(None, help="Tool website"),
+    yes: bool = YesOption,
+):
     """Add a new tool"""
     omoospace = detect_omoospace_or_exit()
     tool = {"name": name}
-    version = inquirer.text(message="tool version:", default="").execute()
-    website = inquirer.text(message="Website:", default="").execute()
+    version = ask_text("tool version:", version, yes=yes)
+    website = ask_text("Website:", website, yes=yes)
     if version:
         tool["version"] = version
     if website:
@@ -291,11 +447,14 @@ def list_tool():
 @maker_app.command("add")
 def add_maker(
     name: str = typer.Argument(..., help="maker name"),
+    email: Optional[str] = typer.Option(None, help="Maker email"),
+    website: Optional[str] = typer.Option(None, help="Maker website"),
+    yes: bool = YesOption,
 ):
     """Add a new maker"""
     omoospace = detect_omoospace_or_exit()
-    email = inquirer.text(message="Email:", default="").execute()
-    website = inquirer.text(message="Website:", default="").execute()
+    email = ask_text("Email:", email, yes=yes)
+    website = ask_text("Website:", website, yes=yes)
     maker = {"name": name}
     if email:
         maker["email"] = email
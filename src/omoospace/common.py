@@ -1,6 +1,409 @@
-from typing import Any
-from omoospace.utils import Opath, yaml
+import base64
+import copy
+import getpass
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Any, Iterator, Optional
+from omoospace.utils import Opath, get_safe_yaml, get_yaml
 from omoospace.language import key_dict
+from omoospace.scanner import DATA_DIR
+
+
+# Parsed profiles keyed by file path, as ((st_ino, st_mtime_ns, st_size), data).
+_profile_cache: dict[str, tuple[tuple[int, int, int], Any]] = {}
+
+# Whether a profile has a shards directory and a journal, keyed by profile
+# file path, as (st_mtime_ns of its directory, (has shards, has journal)).
+_side_cache: dict[str, tuple[int, tuple[bool, bool]]] = {}
+
+# Journals keyed by file path, read up to the last complete record.
+_journal_cache: dict[str, "_Journal"] = {}
+
+# A journal is compacted once it grows past this size, in bytes.
+JOURNAL_MAX_SIZE = 256 * 1024
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from omoospace.common import yaml` working.
+    if name == "yaml":
+        return get_yaml()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _read_file(path: Opath) -> Any:
+    """Read a YAML file, with the safe loader into plain Python objects.
+
+    The parsed data is cached and reused while the file is unchanged.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    cache_key = str(path)
+    try:
+        stat = os.stat(cache_key)
+    except FileNotFoundError:
+        _profile_cache.pop(cache_key, None)
+        raise
+
+    # Every write replaces the file, so a new inode tells a change which
+    # the modification time is too coarse to show.
+    version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _profile_cache.get(cache_key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    with open(cache_key, "r", encoding="utf-8") as file:
+        data = get_safe_yaml().load(file)
+    _profile_cache[cache_key] = (version, data)
+    return data
+
+
+def _find_side_files(profile_file: str) -> tuple[bool, bool]:
+    """Check if a profile has a shards directory and a journal, e.g.
+    Omoospace.d and Omoospace.journal next to Omoospace.yml file.
+
+    The result is reused while the profile's directory has the same
+    modification time, as creating or removing them changes it. It's not
+    kept while the directory was changed within the last second, the time
+    may be too coarse to show another change since.
+
+    Returns:
+        tuple[bool, bool]: Has shards, has a journal.
+    """
+    dirpath, name = os.path.split(profile_file)
+    try:
+        mtime = os.stat(dirpath).st_mtime_ns
+    except OSError:
+        return False, False
+
+    cached = _side_cache.get(profile_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    stem = os.path.join(dirpath, os.path.splitext(name)[0])
+    found = (os.path.isdir(f"{stem}.d"), os.path.isfile(f"{stem}.journal"))
+    if time.time_ns() - mtime > 1_000_000_000:
+        _side_cache[profile_file] = (mtime, found)
+    return found
+
+
+def _load_document(path: Opath) -> Any:
+    """Load a YAML file in round-trip mode, None if it doesn't exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return get_yaml().load(file)
+    except FileNotFoundError:
+        return None
+
+
+def _replace_file(path: Opath, data: Any, merge: bool = True):
+    """Write data to a YAML file, replacing it at once.
+
+    The data is merged into the file loaded again in round-trip mode, so the
+    user's comments and formatting are kept. It's written to a temporary
+    file, synced to disk, then replaces the file, so readers never see it
+    half written.
+
+    Args:
+        path (Opath): The file to write.
+        data (Any): Plain data, or a round-trip document if not merged.
+        merge (bool, optional): Merge into the file's current document.
+            Defaults to True.
+    """
+    cache_key = str(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    document = _load_document(path) if merge else None
+    document = _merge(document, data) if document is not None else data
+
+    temp_file = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with temp_file.open("w", encoding="utf-8") as file:
+            get_yaml().dump(document, file)
+            file.flush()
+            os.fsync(file.fileno())
+        if path.exists():
+            shutil.copymode(path, temp_file)
+        os.replace(temp_file, path)
+    except Exception:
+        _profile_cache.pop(cache_key, None)
+        temp_file.unlink(missing_ok=True)
+        raise
+
+    if os.name != "nt":
+        # Sync the directory too, so the replace itself is durable.
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    # Keep a copy of the written data as the latest snapshot, the caller may
+    # still change the objects given.
+    _profile_cache.pop(cache_key, None)
+    if merge:
+        stat = os.stat(cache_key)
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        _profile_cache[cache_key] = (version, copy.deepcopy(data))
+
+
+class _Journal:
+    """Records of a journal file, read incrementally as it grows."""
+
+    def __init__(self, inode: int, mtime: int):
+        self.inode = inode
+        # Modification time as of the last read, and the size read up to.
+        self.mtime = mtime
+        self.offset = 0
+        # Records keyed by the profile key they change.
+        self.records: dict[str, list[dict]] = {}
+        # Sections with the records applied, keyed by profile key, as
+        # (base section, applied section).
+        self.applied: dict[str, tuple[Any, Any]] = {}
+
+
+def _read_journal(path: Opath) -> Optional[_Journal]:
+    """Read a journal file, only the records appended since the last read.
+
+    Returns:
+        Optional[_Journal]: The journal, None if the file doesn't exist.
+    """
+    cache_key = str(path)
+    try:
+        file = open(cache_key, "rb")
+    except FileNotFoundError:
+        _journal_cache.pop(cache_key, None)
+        return None
+
+    with file:
+        stat = os.fstat(file.fileno())
+        journal = _journal_cache.get(cache_key)
+        # Read again from the start if replaced, truncated or rewritten.
+        if (
+            journal is None
+            or journal.inode != stat.st_ino
+            or stat.st_size < journal.offset
+            or (stat.st_size == journal.offset and stat.st_mtime_ns != journal.mtime)
+        ):
+            journal = _journal_cache[cache_key] = _Journal(
+                stat.st_ino, stat.st_mtime_ns
+            )
+        if stat.st_size == journal.offset:
+            return journal
+
+        file.seek(journal.offset)
+        chunk = file.read()
+        journal.mtime = stat.st_mtime_ns
+
+    # A record being appended is read the next time.
+    end = chunk.rfind(b"\n") + 1
+    for line in chunk[:end].splitlines():
+        try:
+            record = json.loads(line, object_hook=_decode)
+            key = record["path"][0]
+        except (ValueError, KeyError, IndexError, TypeError):
+            continue
+        journal.records.setdefault(key, []).append(record)
+        journal.applied.pop(key, None)
+    journal.offset += end
+    return journal
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+# Decoders of the tagged values in journal records, see `_encode`.
+_DECODERS = {
+    "!map": lambda items: {_hashable(k): v for k, v in items},
+    "!set": lambda items: {_hashable(v) for v in items},
+    "!date": date.fromisoformat,
+    "!datetime": datetime.fromisoformat,
+    "!binary": base64.b64decode,
+}
+
+
+def _encode(value: Any) -> Any:
+    """Encode a profile value for a JSON journal record.
+
+    The YAML types which JSON lacks are tagged, as a mapping of one tag to
+    the encoded value, so they are read back as they were.
+
+    Raises:
+        TypeError: If the value can't be written to the profile either.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        # Other keys than strings, or a mapping taken for a tag.
+        if not all(isinstance(k, str) for k in value) or (
+            len(value) == 1 and next(iter(value)) in _DECODERS
+        ):
+            return {"!map": [[_encode(k), _encode(v)] for k, v in value.items()]}
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return {"!set": [_encode(v) for v in value]}
+    if isinstance(value, datetime):
+        return {"!datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"!date": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"!binary": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"{type(value).__name__} can't be stored in the profile.")
+
+
+def _decode(obj: dict) -> Any:
+    """Decode a tagged value of a journal record, see `_encode`."""
+    if len(obj) == 1:
+        ((tag, value),) = obj.items()
+        decoder = _DECODERS.get(tag)
+        if decoder is not None:
+            return decoder(value)
+    return obj
+
+
+def _diff(path: list, old: Any, new: Any, records: list[dict]):
+    """Collect the records changing old into new, per mapping key."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                records.append({"path": [*path, key], "delete": True})
+        for key, value in new.items():
+            if key in old:
+                _diff([*path, key], old[key], value, records)
+            else:
+                records.append({"path": [*path, key], "value": value})
+    elif type(old) is not type(new) or old != new:
+        records.append({"path": path, "value": new})
+
+
+def _apply(key: str, section: Any, records: list[dict]) -> Any:
+    """Get a copy of the section with the journal records applied."""
+    root = {key: copy.deepcopy(section)}
+    for record in records:
+        *parents, name = record["path"]
+        target = root
+        for parent in parents:
+            if not isinstance(target.get(parent), dict):
+                target[parent] = {}
+            target = target[parent]
+        if record.get("delete"):
+            target.pop(name, None)
+        else:
+            target[name] = copy.deepcopy(record.get("value"))
+    return root.get(key)
+
+
+def _user() -> Optional[str]:
+    try:
+        return getpass.getuser()
+    except (OSError, KeyError, ImportError):
+        return None
+
+
+# Profile locks held by this process keyed by lock file path, as (lock, depth).
+_profile_locks: dict[str, tuple[threading.RLock, int]] = {}
+_profile_locks_guard = threading.Lock()
+
+
+def _lock_file(file):
+    if os.name == "nt":
+        import msvcrt
+
+        file.seek(0)
+        while True:
+            try:
+                # Retries for 10 seconds before raising.
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(file):
+    if os.name == "nt":
+        import msvcrt
+
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _profile_lock(lock_file: Opath):
+    """Hold the exclusive, advisory lock of a profile file.
+
+    The lock is re-entrant within a thread, and serializes writers across
+    threads and processes. Readers don't take it.
+    """
+    key = str(lock_file)
+    with _profile_locks_guard:
+        lock, _ = _profile_locks.setdefault(key, (threading.RLock(), 0))
+
+    with lock:
+        _, depth = _profile_locks[key]
+        _profile_locks[key] = (lock, depth + 1)
+        try:
+            if depth:
+                yield
+                return
+
+            lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(lock_file, "a+b") as file:
+                _lock_file(file)
+                try:
+                    yield
+                finally:
+                    _unlock_file(file)
+        finally:
+            _, depth = _profile_locks[key]
+            _profile_locks[key] = (lock, depth - 1)
+
+
+def _merge(target: Any, data: Any) -> Any:
+    """Merge plain data into round-trip loaded data, in place.
+
+    Mappings and sequences of the target are updated rather than replaced,
+    and unchanged values are kept as they are, so the comments and formatting
+    attached to them are preserved on dump.
+
+    Returns:
+        Any: The merged value, the target itself unless it can't be merged.
+    """
+    if isinstance(target, dict) and isinstance(data, dict):
+        for key in [k for k in target if k not in data]:
+            del target[key]
+        for key, value in data.items():
+            target[key] = _merge(target[key], value) if key in target else value
+        return target
+
+    if isinstance(target, list) and isinstance(data, list):
+        for i, value in enumerate(data):
+            if i < len(target):
+                target[i] = _merge(target[i], value)
+            else:
+                target.append(value)
+        del target[len(data) :]
+        return target
+
+    if isinstance(target, type(data)) and target == data:
+        # Same value, keep e.g. a quoted string or a float as it was written.
+        return target
+    return data
 
 
 class NodeData:
@@ -15,24 +418,277 @@ class NodeData:
 class Profile:
     """Abstract base class for read and write profile"""
 
-    def _read_profile(self):
-        """Read profile data from Omoospace.yml file."""
+    @property
+    def _pending(self) -> Optional[dict[str, Any]]:
+        """Profile values set inside a batch, keyed by profile key.
+
+        Batches are per thread, a batch opened in one thread doesn't catch
+        the changes made in another one.
+        """
+        pending_by_thread = self.__dict__.get("_pending_by_thread") or {}
+        return pending_by_thread.get(threading.get_ident())
+
+    @_pending.setter
+    def _pending(self, value: Optional[dict[str, Any]]):
+        pending_by_thread = self.__dict__.setdefault("_pending_by_thread", {})
+        if value is None:
+            pending_by_thread.pop(threading.get_ident(), None)
+        else:
+            pending_by_thread[threading.get_ident()] = value
+
+    def _read_profile(self) -> dict:
+        """Read profile data from Omoospace.yml file.
+
+        The data is read with `_read_file`, see there. Sections stored in
+        shard files are not included, see `_read_section`. The returned data
+        is shared, do not mutate it without writing it back.
+        """
         if self.profile_file is None:
             raise ValueError("profile file is None.")
 
-        if not self.profile_file.exists():
+        try:
+            return _read_file(self.profile_file) or {}
+        except FileNotFoundError:
             return {}
-        with self.profile_file.open("r", encoding="utf-8") as file:
-            return yaml.load(file) or {}
 
-    def _write_profile(self, data):
-        """Write profile data to Omoospace.yml file."""
+    def _read_section(self, key: str) -> Any:
+        """Read a profile section, from its shard file if it has one.
+
+        If the profile has a journal, its records are applied over the
+        section. The returned data is shared too.
+
+        Args:
+            key (str): The profile key, as written in the file.
+        """
+        has_shards, has_journal = _find_side_files(str(self.profile_file))
+        if has_shards:
+            try:
+                section = _read_file(self._shard_file(key))
+            except FileNotFoundError:
+                section = self._read_profile().get(key)
+        else:
+            section = self._read_profile().get(key)
+
+        if not has_journal:
+            return section
+        journal = _read_journal(self.journal_file)
+        if journal is None or key not in journal.records:
+            return section
+
+        applied = journal.applied.get(key)
+        if applied is None or applied[0] is not section:
+            applied = (section, _apply(key, section, journal.records[key]))
+            journal.applied[key] = applied
+        return applied[1]
+
+    @property
+    def shards_dir(self) -> Opath:
+        """Opath: Directory of the profile's shard files, e.g. Omoospace.d"""
+        return self.profile_file.with_name(f"{self.profile_file.stem}.d")
+
+    def _shard_file(self, key: str) -> Opath:
+        return self.shards_dir / f"{key}.yml"
+
+    def _has_shards(self) -> bool:
+        return _find_side_files(str(self.profile_file))[0]
+
+    def _has_journal(self) -> bool:
+        return _find_side_files(str(self.profile_file))[1]
+
+    @property
+    def journal_file(self) -> Opath:
+        """Opath: The profile's journal file, e.g. Omoospace.journal"""
+        return self.profile_file.with_suffix(".journal")
+
+    @property
+    def _history_file(self) -> Opath:
+        return Opath(
+            self.profile_file.parent, DATA_DIR, f"{self.profile_file.name}.history"
+        )
+
+    @property
+    def _lock_file(self) -> Opath:
+        return Opath(
+            self.profile_file.parent, DATA_DIR, f"{self.profile_file.name}.lock"
+        )
+
+    def _write_profile(self, changes: dict[str, Any]):
+        """Write changed profile values to Omoospace.yml file.
+
+        Must be called holding the profile lock. If the profile has a
+        journal, the changes are appended to it, see `_append_journal`.
+
+        Args:
+            changes (dict[str, Any]): The new values, keyed by profile key.
+        """
         if self.profile_file is None:
             raise ValueError("profile file is None.")
 
-        self.profile_file.parent.mkdir(parents=True, exist_ok=True)
-        with self.profile_file.open("w", encoding="utf-8") as file:
-            yaml.dump(data, file)
+        if self._has_journal():
+            self._append_journal(changes)
+        else:
+            self._write_files(changes)
+
+    def _append_journal(self, changes: dict[str, Any]):
+        """Append the changes to the journal, one record per changed field.
+
+        Each record is a JSON line, with the time, the user, the path of the
+        field and its new value, see `_encode`. The journal is compacted once
+        it's grown past `JOURNAL_MAX_SIZE`.
+        """
+        records = []
+        for key, value in changes.items():
+            _diff([key], self._read_section(key), value, records)
+        if not records:
+            return
+
+        stamp = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "user": _user(),
+        }
+        lines = "".join(
+            json.dumps({**stamp, **_encode(record)}, ensure_ascii=False) + "\n"
+            for record in records
+        )
+
+        # Appended with one write, readers see whole records or none.
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, lines.encode("utf-8"))
+            os.fsync(fd)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+        if size > JOURNAL_MAX_SIZE:
+            self.compact()
+
+    def _write_files(self, changes: dict[str, Any]):
+        """Write changed profile values to the profile and shard files.
+
+        A section with a shard file is written there, only the files holding
+        changed values are written. See `_replace_file`.
+        """
+        main_changes = {}
+        has_shards = self._has_shards()
+        for key, value in changes.items():
+            shard_file = self._shard_file(key)
+            if has_shards and shard_file.is_file():
+                _replace_file(shard_file, value)
+            else:
+                main_changes[key] = value
+
+        if main_changes or not self.profile_file.exists():
+            _replace_file(self.profile_file, {**self._read_profile(), **main_changes})
+
+    def create_journal(self):
+        """Start journaling profile changes, next to Omoospace.yml file.
+
+        Changes are then appended to the journal instead of rewriting the
+        profile files, and the journal is folded back in by `compact`. The
+        journaled records are kept as the profile history.
+        """
+        with _profile_lock(self._lock_file):
+            self.journal_file.touch(exist_ok=True)
+
+    def remove_journal(self):
+        """Fold the journal into the profile files and stop journaling."""
+        with _profile_lock(self._lock_file):
+            self.compact()
+            self.journal_file.unlink(missing_ok=True)
+            _journal_cache.pop(str(self.journal_file), None)
+
+    def compact(self):
+        """Fold the journal into the profile files, and start it empty.
+
+        The records folded are appended to the history, see `history`.
+        """
+        with _profile_lock(self._lock_file):
+            journal = _read_journal(self.journal_file)
+            if journal is None or not journal.records:
+                return
+
+            # The profile files are written first, records applied again
+            # over them give the same values.
+            self._write_files(
+                {key: self._read_section(key) for key in journal.records}
+            )
+
+            self._history_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, "rb") as source:
+                with open(self._history_file, "ab") as target:
+                    shutil.copyfileobj(source, target)
+
+            temp_file = self.journal_file.with_name(
+                f"{self.journal_file.name}.{os.getpid()}.tmp"
+            )
+            temp_file.write_bytes(b"")
+            os.replace(temp_file, self.journal_file)
+
+    def history(self) -> Iterator[dict]:
+        """Iterate the journaled profile changes, oldest first.
+
+        Yields:
+            dict: The records, with ``time``, ``user``, ``path``, and
+                ``value`` or ``delete``.
+        """
+        for path in [self._history_file, self.journal_file]:
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    for line in file:
+                        try:
+                            yield json.loads(line, object_hook=_decode)
+                        except ValueError:
+                            continue
+            except FileNotFoundError:
+                continue
+
+    def split_profile(self, keys: Optional[list[str]] = None):
+        """Move profile sections to their own files, in the shards directory.
+
+        A sharded section is read and written on its own, so changing a work
+        doesn't rewrite the whole profile, and reading the brief doesn't
+        parse all the works.
+
+        Args:
+            keys (list[str], optional): The sections to move. Defaults to None,
+                the makers, tools, works and notes.
+        """
+        keys = [self._key(k) for k in keys or ["makers", "tools", "works", "notes"]]
+        with _profile_lock(self._lock_file):
+            self.compact()
+            document = _load_document(self.profile_file) or {}
+            self.shards_dir.mkdir(parents=True, exist_ok=True)
+
+            # Shards are written first, they win over the profile file.
+            for key in keys:
+                shard_file = self._shard_file(key)
+                if not shard_file.exists():
+                    _replace_file(shard_file, document.get(key) or {}, merge=False)
+            for key in keys:
+                document.pop(key, None)
+            _replace_file(self.profile_file, document, merge=False)
+
+    def merge_profile(self):
+        """Move the sharded sections back into Omoospace.yml file."""
+        with _profile_lock(self._lock_file):
+            self.compact()
+            if not self.shards_dir.is_dir():
+                return
+
+            shard_files = sorted(self.shards_dir.glob("*.yml"))
+            document = _load_document(self.profile_file) or {}
+            for shard_file in shard_files:
+                document[shard_file.stem] = _load_document(shard_file)
+            _replace_file(self.profile_file, document, merge=False)
+
+            for shard_file in shard_files:
+                shard_file.unlink()
+                _profile_cache.pop(str(shard_file), None)
+            try:
+                self.shards_dir.rmdir()
+            except OSError:
+                pass
 
     @property
     def language(self) -> str:
@@ -43,16 +699,67 @@ class Profile:
     def _key(self, key) -> str:
         return key_dict[key][self.language]
 
+    def _peek(self, key: str) -> Any:
+        """Get the value from the profile snapshot, without copying it."""
+        key = self._key(key)
+        if self._pending is not None and key in self._pending:
+            return self._pending[key]
+
+        return self._read_section(key)
+
     def get(self, key: str) -> Any:
         """Get the latest data for this item from the profile file."""
-        profile = self._read_profile()
-        return profile.get(self._key(key))
+        return copy.deepcopy(self._peek(key))
 
     def set(self, key: str, value: Any):
         """Set the value for the given key in the profile file."""
-        profile = self._read_profile()
-        profile[self._key(key)] = value
-        self._write_profile(profile)
+        if self._pending is not None:
+            self._pending[self._key(key)] = value
+            return
+
+        with self.batch():
+            self._pending[self._key(key)] = value
+
+    @contextmanager
+    def batch(self):
+        """Collect profile changes in memory and write them once.
+
+        All ``set()`` calls inside the block, including the ones made by
+        profile items, are written to the profile file once on exit. If an
+        exception is raised, the changes made inside the block are discarded.
+        Batches can be nested, only the outermost one writes.
+
+        The outermost batch holds the profile lock, so values read inside the
+        block are not changed by other writers, threads or processes, before
+        they are written. Keep the block short, other writers wait for it.
+
+        Usage:
+        ```python
+        with omoospace.batch():
+            omoospace.brief = "A new brief."
+            omoospace.add_maker("Alice")
+        ```
+        """
+        if self._pending is not None:
+            saved = dict(self._pending)
+            try:
+                yield self
+            except BaseException:
+                self._pending = saved
+                raise
+            return
+
+        with _profile_lock(self._lock_file):
+            self._pending = {}
+            try:
+                yield self
+            except BaseException:
+                self._pending = None
+                raise
+
+            pending, self._pending = self._pending, None
+            if pending:
+                self._write_profile(pending)
 
 
 class ProfileItem:
@@ -71,11 +778,13 @@ class ProfileItem:
         self._omoospace = omoospace
 
         # init item with name if not find in profile
-        item_dict = self._omoospace.get(self._dict_name) or {}
-        if self._item_name not in item_dict:
-            item_dict[self._item_name] = {}
-
-        self._omoospace.set(self._dict_name, item_dict)
+        if self._item_name in (self._omoospace._peek(self._dict_name) or {}):
+            return
+        with self._omoospace.batch():
+            item_dict = self._items() or {}
+            if self._item_name not in item_dict:
+                item_dict[self._item_name] = {}
+                self._omoospace.set(self._dict_name, item_dict)
 
     def __repr__(self):
         return self.name
@@ -83,10 +792,19 @@ class ProfileItem:
     def _key(self, key) -> str:
         return key_dict[key][self._omoospace.language]
 
+    def _items(self) -> Optional[dict]:
+        """Get a shallow copy of the items dictionary, e.g. makers.
+
+        The items are shared with the profile snapshot. Replace them, don't
+        mutate them. Unlike a deep copy, this is cheap for many items.
+        """
+        items = self._omoospace._peek(self._dict_name)
+        return dict(items) if isinstance(items, dict) else items
+
     @property
     def data(self):
         # e.g. makers
-        item_dict = self._omoospace.get(self._dict_name)
+        item_dict = self._omoospace._peek(self._dict_name)
         if item_dict is None:
             raise AttributeError(f"{self._dict_name} not found in profile.")
 
@@ -94,16 +812,15 @@ class ProfileItem:
         data = item_dict.get(self._item_name)
         if data is None:
             raise AttributeError(f"{self._item_name} not found in {self._dict_name}.")
-        return data
+        return copy.deepcopy(data)
 
     @data.setter
     def data(self, value: Any):
         """Update the profile with current data."""
-        items = self._omoospace.get(self._dict_name) or {}
-
-        items[self._item_name] = value
-
-        self._omoospace.set(self._dict_name, items)
+        with self._omoospace.batch():
+            items = self._items() or {}
+            items[self._item_name] = value
+            self._omoospace.set(self._dict_name, items)
 
     def get(self, key: str) -> Any:
         """Get the latest data for this item from the profile file."""
@@ -111,23 +828,24 @@ class ProfileItem:
 
     def set(self, key: str, value: Any):
         """Update the profile with current data."""
-        data = self.data if isinstance(self.data, dict) else {}
-
-        data[self._key(key)] = value
-
-        self.data = data
+        with self._omoospace.batch():
+            data = self.data if isinstance(self.data, dict) else {}
+            data[self._key(key)] = value
+            self.data = data
 
     def remove(self):
         """Remove this item from the profile."""
-        item_dict = self._omoospace.get(self._dict_name)
-        if item_dict is None:
-            raise AttributeError(f"{self._dict_name} not found in profile.")
-
-        if self._item_name in item_dict:
+        with self._omoospace.batch():
+            item_dict = self._items()
+            if item_dict is None:
+                raise AttributeError(f"{self._dict_name} not found in profile.")
+
+            if self._item_name not in item_dict:
+                raise AttributeError(
+                    f"{self._item_name} not found in {self._dict_name}."
+                )
             del item_dict[self._item_name]
             self._omoospace.set(self._dict_name, item_dict)
-        else:
-            raise AttributeError(f"{self._item_name} not found in {self._dict_name}.")
 
     @property
     def name(self) -> str:
@@ -136,12 +854,13 @@ class ProfileItem:
 
     @name.setter
     def name(self, value: str):
-        item_dict = self._omoospace.get(self._dict_name)
+        with self._omoospace.batch():
+            item_dict = self._items()
 
-        if self.name in item_dict:
-            del item_dict[self.name]
+            if self.name in item_dict:
+                del item_dict[self.name]
 
-        item_dict[value] = self.data
-        self._omoospace.set(self._dict_name, item_dict)
+            item_dict[value] = self.data
+            self._omoospace.set(self._dict_name, item_dict)
 
         self._item_name = value
@@ -0,0 +1,179 @@
+import json
+import sqlite3
+from typing import Optional
+
+from omoospace.common import NodeData
+from omoospace.scanner import DATA_DIR, Entry
+from omoospace.utils import AnyPath, Opath
+
+# Bump when the stored data changes, older indexes are then rebuilt.
+INDEX_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY, mtime INTEGER NOT NULL, entries TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subspaces (
+    path TEXT PRIMARY KEY, pathname TEXT NOT NULL, chain TEXT NOT NULL
+);
+"""
+
+
+class SubspaceIndex:
+    """Persistent index of the subspaces directory, in ``.omoospace/index``.
+
+    The index is a SQLite database keeping the listing and modification time
+    of each directory walked, and the pathname and objective data of each
+    subspace found. A process opening the omoospace loads it, and only lists
+    again the directories whose modification time has changed.
+
+    The index is optional, and only used once created. It's a cache, when it
+    can't be read or written the subspaces directory is scanned as usual.
+
+    Usage:
+    ```python
+    index = SubspaceIndex(omoospace.root_dir)
+    index.create()
+    ```
+    """
+
+    def __init__(self, root_dir: AnyPath):
+        """Initialize the index of an omoospace.
+
+        Args:
+            root_dir (AnyPath): Omoospace root directory.
+        """
+        self.index_file = Opath(root_dir, DATA_DIR, "index")
+
+    def exists(self) -> bool:
+        """Check if the index has been created.
+
+        Returns:
+            bool: True if the index file exists.
+        """
+        return self.index_file.is_file()
+
+    def create(self):
+        """Create the index, empty until the omoospace is scanned."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    def remove(self):
+        """Remove the index."""
+        self.index_file.unlink(missing_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_file, timeout=10)
+
+    def load(
+        self, settings: tuple
+    ) -> Optional[tuple[dict[str, tuple[int, list[Entry]]], dict[str, list[NodeData]]]]:
+        """Load the directory listings and the subspaces' objective data.
+
+        Args:
+            settings (tuple): The scanner settings, the index is only valid if
+                they are the same as when it was saved.
+
+        Returns:
+            Optional[tuple[dict, dict]]: The listings keyed by directory path,
+                and the objective data keyed by subspace path. None if the
+                index is missing, unreadable or outdated.
+        """
+        if not self.exists():
+            return None
+
+        try:
+            connection = self._connect()
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta"))
+                if meta.get("version") != str(INDEX_VERSION):
+                    return None
+                if meta.get("settings") != json.dumps(settings):
+                    return None
+
+                listings = {
+                    path: (mtime, [tuple(e) for e in json.loads(entries)])
+                    for path, mtime, entries in connection.execute(
+                        "SELECT path, mtime, entries FROM dirs"
+                    )
+                }
+                path_data = {
+                    path: [
+                        NodeData(name, [Opath(s) for s in subspaces])
+                        for name, subspaces in json.loads(chain)
+                    ]
+                    for path, chain in connection.execute(
+                        "SELECT path, chain FROM subspaces"
+                    )
+                }
+            finally:
+                connection.close()
+        except (sqlite3.Error, ValueError):
+            return None
+
+        return listings, path_data
+
+    def save(
+        self,
+        settings: tuple,
+        listings: dict[str, tuple[int, list[Entry]]],
+        path_data: dict[str, list[NodeData]],
+    ) -> bool:
+        """Replace the content of the index.
+
+        Args:
+            settings (tuple): The scanner settings.
+            listings (dict[str, tuple[int, list[Entry]]]): Directory listings
+                keyed by path, as (st_mtime_ns, entries).
+            path_data (dict[str, list[NodeData]]): Objective data keyed by
+                subspace path.
+
+        Returns:
+            bool: True if saved, False if the index is missing or not writable.
+        """
+        if not self.exists():
+            return False
+
+        dirs = [
+            (path, mtime, json.dumps(entries))
+            for path, (mtime, entries) in listings.items()
+        ]
+        subspaces = [
+            (
+                path,
+                "_".join(d.name for d in data),
+                json.dumps([(d.name, [str(s) for s in d.subspaces]) for d in data]),
+            )
+            for path, data in path_data.items()
+        ]
+
+        try:
+            connection = self._connect()
+            try:
+                connection.executescript(_SCHEMA)
+                with connection:
+                    connection.execute("DELETE FROM meta")
+                    connection.execute("DELETE FROM dirs")
+                    connection.execute("DELETE FROM subspaces")
+                    connection.executemany(
+                        "INSERT INTO meta VALUES (?, ?)",
+                        [
+                            ("version", str(INDEX_VERSION)),
+                            ("settings", json.dumps(settings)),
+                        ],
+                    )
+                    connection.executemany("INSERT INTO dirs VALUES (?, ?, ?)", dirs)
+                    connection.executemany(
+                        "INSERT INTO subspaces VALUES (?, ?, ?)", subspaces
+                    )
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return False
+
+        return True
@@ -25,26 +25,49 @@ class Maker(ProfileItem):
     def __init__(self, omoospace, maker: Union[str, MakerDict, "Maker"]):
         if isinstance(maker, str):
             super().__init__(omoospace, maker)
+            return
 
-        elif isinstance(maker, dict) and "name" in maker:
-            super().__init__(omoospace, maker["name"])
-            if "email" in maker:
-                self.email = maker["email"]
+        # Write the item and all its fields to the profile at once.
+        with omoospace.batch():
+            if isinstance(maker, dict) and "name" in maker:
+                super().__init__(omoospace, maker["name"])
+                if "email" in maker:
+                    self.email = maker["email"]
 
-            if "website" in maker:
-                self.website = maker["website"]
+                if "website" in maker:
+                    self.website = maker["website"]
 
-        elif isinstance(maker.name, str):
-            super().__init__(omoospace, maker.name)
+            elif isinstance(maker.name, str):
+                super().__init__(omoospace, maker.name)
 
-            if maker.email:
-                self.email = maker.email
+                if maker.email:
+                    self.email = maker.email
 
-            if maker.website:
-                self.website = maker.website
-        else:
+                if maker.website:
+                    self.website = maker.website
+            else:
+                raise ValueError(f"{maker} is not a valid Maker.")
+
+    @staticmethod
+    def validate(maker: Union[str, MakerDict, "Maker"]):
+        """Check a maker and its fields, without adding it.
+
+        Args:
+            maker (Union[str, MakerDict, Maker]): The maker.
+
+        Raises:
+            ValueError: If the maker or one of its fields is not valid.
+        """
+        if isinstance(maker, (str, Maker)):
+            return
+        if not (isinstance(maker, dict) and "name" in maker):
             raise ValueError(f"{maker} is not a valid Maker.")
 
+        if (email := maker.get("email")) and not is_email(email):
+            raise ValueError(f"{email} is not a valid email.")
+        if (website := maker.get("website")) and not is_url(website):
+            raise ValueError(f"{website} is not a valid url.")
+
     @property
     def email(self) -> Optional[str]:
         """Get the email from the latest profile data."""
@@ -101,32 +124,55 @@ class Tool(ProfileItem):
     def __init__(self, omoospace, tool: Union[str, ToolDict, "Tool"]):
         if isinstance(tool, str):
             super().__init__(omoospace, tool)
+            return
 
-        elif isinstance(tool, dict) and "name" in tool:
-            super().__init__(omoospace, tool["name"])
-            if "version" in tool:
-                self.version = tool["version"]
+        # Write the item and all its fields to the profile at once.
+        with omoospace.batch():
+            if isinstance(tool, dict) and "name" in tool:
+                super().__init__(omoospace, tool["name"])
+                if "version" in tool:
+                    self.version = tool["version"]
 
-            if "website" in tool:
-                self.website = tool["website"]
+                if "website" in tool:
+                    self.website = tool["website"]
 
-            if "extensions" in tool:
-                self.extensions = tool["extensions"]
+                if "extensions" in tool:
+                    self.extensions = tool["extensions"]
 
-        elif isinstance(tool.name, str):
-            super().__init__(omoospace, tool.name)
+            elif isinstance(tool.name, str):
+                super().__init__(omoospace, tool.name)
 
-            if tool.version:
-                self.version = tool.version
+                if tool.version:
+                    self.version = tool.version
 
-            if tool.website:
-                self.website = tool.website
+                if tool.website:
+                    self.website = tool.website
 
-            if tool.extensions:
-                self.extensions = tool.extensions
-        else:
+                if tool.extensions:
+                    self.extensions = tool.extensions
+            else:
+                raise ValueError(f"{tool} is not a valid Tool.")
+
+    @staticmethod
+    def validate(tool: Union[str, ToolDict, "Tool"]):
+        """Check a tool and its fields, without adding it.
+
+        Args:
+            tool (Union[str, ToolDict, Tool]): The tool.
+
+        Raises:
+            ValueError: If the tool or one of its fields is not valid.
+        """
+        if isinstance(tool, (str, Tool)):
+            return
+        if not (isinstance(tool, dict) and "name" in tool):
             raise ValueError(f"{tool} is not a valid Tool.")
 
+        if (version := tool.get("version")) and not is_version(version):
+            raise ValueError(f"{version} is not a valid version.")
+        if (website := tool.get("website")) and not is_url(website):
+            raise ValueError(f"{website} is not a valid url.")
+
     @property
     def version(self) -> Optional[str]:
         """Get the version from the latest profile data."""
@@ -199,38 +245,67 @@ class Work(ProfileItem):
     def __init__(self, omoospace, work: Union[str, WorkDict, "Work"]):
         if isinstance(work, str):
             super().__init__(omoospace, work)
+            return
 
-        elif isinstance(work, dict) and "name" in work:
-            super().__init__(omoospace, work["name"])
-            if "brief" in work:
-                self.brief = work["brief"]
+        # Write the item and all its fields to the profile at once.
+        with omoospace.batch():
+            if isinstance(work, dict) and "name" in work:
+                super().__init__(omoospace, work["name"])
+                if "brief" in work:
+                    self.brief = work["brief"]
 
-            if "version" in work:
-                self.version = work["version"]
+                if "version" in work:
+                    self.version = work["version"]
 
-            if "contents" in work:
-                self.contents = work["contents"]
+                if "contents" in work:
+                    self.contents = work["contents"]
 
-            if "contributions" in work:
-                self.contributions = work["contributions"]
+                if "contributions" in work:
+                    self.contributions = work["contributions"]
 
-        elif isinstance(work.name, str):
-            super().__init__(omoospace, work.name)
+            elif isinstance(work.name, str):
+                super().__init__(omoospace, work.name)
 
-            if work.brief:
-                self.brief = work.brief
+                if work.brief:
+                    self.brief = work.brief
 
-            if work.version:
-                self.version = work.version
+                if work.version:
+                    self.version = work.version
 
-            if work.contents:
-                self.contents = work.contents
+                if work.contents:
+                    self.contents = work.contents
 
-            if work.contributions:
-                self.contributions = work.contributions
-        else:
+                if work.contributions:
+                    self.contributions = work.contributions
+            else:
+                raise ValueError(f"{work} is not a valid Work.")
+
+    @staticmethod
+    def validate(work: Union[str, WorkDict, "Work"]):
+        """Check a work and its fields, without adding it.
+
+        Args:
+            work (Union[str, WorkDict, Work]): The work.
+
+        Raises:
+            ValueError: If the work or one of its fields is not valid.
+        """
+        if isinstance(work, (str, Work)):
+            return
+        if not (isinstance(work, dict) and "name" in work):
             raise ValueError(f"{work} is not a valid Work.")
 
+        if (version := work.get("version")) and not is_version(version):
+            raise ValueError(f"{version} is not a valid version.")
+
+        contributions = work.get("contributions") or []
+        if isinstance(contributions, dict):
+            makers = [m for makers in contributions.values() for m in makers]
+        else:
+            makers = list(contributions)
+        for maker in makers:
+            Maker.validate(maker)
+
     @property
     def brief(self) -> Optional[str]:
         """Get the brief from the latest profile data."""
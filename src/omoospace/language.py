@@ -8,6 +8,7 @@ key_dict = {
     "subspaces_dir": {"en": "subspaces_dir", "zh": "Subspaces文件夹"},
     "contents_dir": {"en": "contents_dir", "zh": "Contents文件夹"},
     "ignore": {"en": "ignore", "zh": "忽略列表"},
+    "scan_workers": {"en": "scan_workers", "zh": "扫描线程数"},
     "brief": {"en": "brief", "zh": "简述"},
     "notes": {"en": "notes", "zh": "记录列表"},
     "maker": {"en": "maker", "zh": "主创"},
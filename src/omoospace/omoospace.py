@@ -1,6 +1,11 @@
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
-from typing import Optional, Union
-from nutree import Tree, Node
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
 from omoospace.common import Profile, NodeData
 from omoospace.items import (
     Maker,
@@ -10,10 +15,143 @@ from omoospace.items import (
     Work,
     WorkDict,
 )
+from omoospace.index import SubspaceIndex
 from omoospace.language import ALLOWED_LANGS, Language
-from omoospace.utils import Oset, make_path, normalize_name, Opath, AnyPath
+from omoospace.scanner import DATA_DIR, SubspaceScanner
+from omoospace.utils import (
+    Oset,
+    make_path,
+    normalize_name,
+    Opath,
+    AnyPath,
+    _abspath,
+    _is_under,
+    _rebase,
+)
 from omoospace.validators import is_ignore
 
+if TYPE_CHECKING:
+    from nutree import Node, Tree
+    from omoospace.watch import Watcher
+
+
+# Profile files found in a directory, keyed by directory path, as
+# (st_mtime_ns, profile files). Directories without any are kept as well,
+# the least recently used are dropped past ROOT_CACHE_SIZE.
+_root_cache: OrderedDict[str, tuple[int, tuple[Opath, ...]]] = OrderedDict()
+_root_lock = threading.Lock()
+ROOT_CACHE_SIZE = 4096
+
+
+def _find_profile_files(dirpath: str) -> tuple[Opath, ...]:
+    """Find the Omoospace profile files in a directory.
+
+    The result is reused while the directory's modification time is unchanged,
+    as adding, removing or renaming a file in it changes the time.
+
+    Args:
+        dirpath (str): Directory to look in.
+
+    Returns:
+        tuple[Opath, ...]: The files named 'Omoospace' with any extension.
+    """
+    try:
+        dir_stat = os.stat(dirpath)
+    except OSError:
+        return ()
+    if not stat.S_ISDIR(dir_stat.st_mode):
+        return ()
+
+    with _root_lock:
+        cached = _root_cache.get(dirpath)
+        if cached and cached[0] == dir_stat.st_mtime_ns:
+            _root_cache.move_to_end(dirpath)
+            return cached[1]
+
+    candidates = tuple(c for c in Opath(dirpath).glob("Omoospace.*") if c.is_file())
+    with _root_lock:
+        _root_cache[dirpath] = (dir_stat.st_mtime_ns, candidates)
+        _root_cache.move_to_end(dirpath)
+        while len(_root_cache) > ROOT_CACHE_SIZE:
+            _root_cache.popitem(last=False)
+    return candidates
+
+
+# Objective trees keyed by profile file path, each language has its own.
+_tree_cache: dict[str, "ObjectiveTree"] = {}
+
+# Seconds between full checks of a cached tree, see ObjectiveTree.is_stale.
+TREE_CHECK_INTERVAL = 1.0
+
+# Locks of the cached trees, keyed like the cache. Each is held to build,
+# check or patch its tree, so threads never see a tree half patched, while
+# the trees of other omoospaces can be used meanwhile.
+_tree_locks: dict[str, threading.RLock] = {}
+
+# Held only to look up or change `_tree_cache` and `_tree_locks`.
+_tree_guard = threading.Lock()
+
+
+def _tree_lock(cache_key: str) -> threading.RLock:
+    """Get the lock of a cached tree, see `_tree_locks`."""
+    with _tree_guard:
+        lock = _tree_locks.get(cache_key)
+        if lock is None:
+            lock = _tree_locks[cache_key] = threading.RLock()
+        return lock
+
+
+def _cached_tree(cache_key: str) -> Optional["ObjectiveTree"]:
+    with _tree_guard:
+        return _tree_cache.get(cache_key)
+
+
+def _cache_tree(cache_key: str, tree: Optional["ObjectiveTree"]):
+    with _tree_guard:
+        if tree is None:
+            _tree_cache.pop(cache_key, None)
+        else:
+            _tree_cache[cache_key] = tree
+
+# Objective names extracted from a subspace and its parents, from top to
+# bottom, each with the subspaces it was extracted from.
+ObjectiveChain = tuple[tuple[str, tuple[Opath, ...]], ...]
+
+
+@lru_cache(maxsize=4096)
+def _clip_names(prev_names: tuple[str, ...], names: tuple[str, ...]) -> tuple[str, ...]:
+    """Clip the names which repeat the end of the previous names.
+
+    e.g. path: ['Seq010'], enity name: `Seq010_Shot0100.blend`
+    `Seq010` is the matched namespace, which will be cliped.
+    """
+    prev_count = len(prev_names)
+    for i in range(prev_count):
+        suffix = "_".join(prev_names[i:])
+        prefix = "_".join(names[: prev_count - i])
+        if suffix == prefix:
+            return names[prev_count - i :]
+
+    return names
+
+
+def _append_objectives(chain: ObjectiveChain, subspace: Opath) -> ObjectiveChain:
+    """Append the objectives named by a subspace to the chain of its parents."""
+    # Normalize subspace name for objective name
+    subspace_name = normalize_name(subspace.stem)
+
+    # Objective names are the strings that splited by "_".
+    # e.g. `Seq010_Shot0100.blend` has two objective (names): `Seq010` and `Shot0100`
+    prev_names = tuple(name for name, _ in chain)
+    names = _clip_names(prev_names, tuple(subspace_name.split("_")))
+
+    # Sometimes all namspaces are cliped. but still need to append subspace
+    if len(names) == 0:
+        name, subspaces = chain[-1]
+        return chain[:-1] + ((name, subspaces + (subspace,)),)
+
+    return chain + tuple((name, (subspace,)) for name in names)
+
 
 class ObjectiveType(Enum):
     DIRECTORY = "directory"
@@ -29,14 +167,17 @@ class Objective:
     and relationships with other objectives.
     """
 
-    def __init__(self, node: Node):
+    def __init__(self, node: "Node", tree: "ObjectiveTree" = None):
         """Initialize an Objective instance.
 
         Args:
             node (Node): The underlying nutree Node object that this
                 Objective wraps.
+            tree (ObjectiveTree, optional): The objective tree the node
+                belongs to, used for indexed lookups. Defaults to None.
         """
         self._node = node
+        self._tree = tree
 
     def __repr__(self) -> str:
         """Return a string representation of the Objective.
@@ -48,12 +189,22 @@ class Objective:
 
     def __contains__(self, name: str) -> bool:
         """Implement ``name in tree`` syntax to check for node existence."""
-        return bool(self._node.find(match=lambda n: n.data.name == name))
+        if self._tree is None:
+            return bool(self._node.find(match=lambda n: n.data.name == name))
+
+        # Look up nodes by name, then check if any is under this node.
+        for node in self._tree._nodes_by_name.get(name, ()):
+            parent = node.parent
+            while parent is not None:
+                if parent is self._node:
+                    return True
+                parent = parent.parent
+        return False
 
     def __iter__(self):
         """Make ``for obj in tree`` iterate over all nodes."""
         iter = self._node.__iter__()
-        return (Objective(n) for n in iter)
+        return (Objective(n, self._tree) for n in iter)
 
     @property
     def name(self) -> str:
@@ -107,45 +258,188 @@ class Objective:
     def parent(self) -> "Objective":
         """Objective: Parent subspace."""
         node = self._node.parent
-        return Objective(node) if node else None
+        return Objective(node, self._tree) if node else None
 
     @property
     def children(self) -> list["Objective"]:
         """list["Objective"]: Children subspace."""
         nodes = self._node.children
-        return [Objective(node) for node in nodes]
+        return [Objective(node, self._tree) for node in nodes]
 
 
 class ObjectiveTree:
     """Objective tree structure for managing objectives hierarchy."""
 
     def __init__(self, omoospace: "Omoospace"):
+        # nutree is only needed once a tree is built.
+        from nutree import Tree
+
         self._tree = Tree()
         self.omoospace = omoospace
-        for subspace in self.omoospace.subspaces:
-            node_iter: Union[Node, Tree] = self._tree
+        self._scanner = SubspaceScanner.from_omoospace(omoospace)
 
-            # extract objective data list from the subspace.
-            path_data = Omoospace.extract_path_data(subspace)
+        # objective chains of parent directories, shared by their subspaces.
+        self._memo: dict[Opath, ObjectiveChain] = {}
 
-            # add single objective path from top to bottom to the tree.
-            for data in path_data:
-                node = next(
-                    (n for n in node_iter.children if n.data.name == data.name), None
-                )
+        # children by name, subspaces and pathname of each node, keyed by node id.
+        self._children: dict[int, dict[str, "Node"]] = {}
+        self._subspaces: dict[int, set[Opath]] = {}
+        self._pathnames: dict[int, str] = {}
+
+        self._nodes_by_subspace: dict[Opath, list["Node"]] = {}
+        self._nodes_by_pathname: dict[str, "Node"] = {}
+        self._nodes_by_name: dict[str, list["Node"]] = {}
+
+        # objective data of each subspace, keyed by subspace path.
+        self._path_data: dict[str, list[NodeData]] = {}
+
+        # listings and objective data are taken from the index if there is one.
+        index = SubspaceIndex(omoospace.root_dir)
+        stored = index.load(self._scanner.settings)
+        stored_path_data = {}
+        if stored:
+            self._scanner.listings, stored_path_data = stored
+        mtimes = self._scanner.mtimes()
+
+        for subspace in self._scanner.scan():
+            self._add(subspace, stored_path_data.get(str(subspace)))
+
+        if index.exists() and (
+            self._scanner.mtimes() != mtimes
+            or self._path_data.keys() != stored_path_data.keys()
+        ):
+            index.save(self._scanner.settings, self._scanner.listings, self._path_data)
+
+        # nodes of the same name are kept in depth-first order.
+        self._nodes_by_name.clear()
+        for node in self._tree:
+            self._nodes_by_name.setdefault(node.data.name, []).append(node)
+
+        # when every listed directory was last checked, see is_stale.
+        self._checked_at = time.monotonic()
+
+    def _add(self, subspace: Opath, path_data: Optional[list[NodeData]] = None):
+        """Add the objectives of a subspace to the tree."""
+        node_iter: Union["Node", "Tree"] = self._tree
+        pathname = ""
+
+        # extract objective data list from the subspace.
+        if path_data is None:
+            path_data = self.omoospace._extract_path_data(subspace, self._memo)
+        self._path_data[str(subspace)] = path_data
+
+        # add single objective path from top to bottom to the tree.
+        for data in path_data:
+            siblings = self._children.setdefault(id(node_iter), {})
+            node = siblings.get(data.name)
+            pathname = f"{pathname}_{data.name}" if pathname else data.name
+
+            if node is None:
+                node = node_iter.add(NodeData(data.name, []))
+                siblings[data.name] = node
+                self._subspaces[id(node)] = set()
+                self._pathnames[id(node)] = pathname
+                self._nodes_by_pathname[pathname] = node
+                self._nodes_by_name.setdefault(data.name, []).append(node)
+
+            node_subspaces = self._subspaces[id(node)]
+            for s in data.subspaces:
+                if s not in node_subspaces:
+                    node_subspaces.add(s)
+                    node.data.subspaces.append(s)
+                    self._nodes_by_subspace.setdefault(s, []).append(node)
+
+            node_iter = node
+
+    def _remove(self, subspace: Opath):
+        """Remove a subspace from the tree, with the objectives left empty."""
+        self._path_data.pop(str(subspace), None)
+        for node in self._nodes_by_subspace.pop(subspace, []):
+            node.data.subspaces.remove(subspace)
+            self._subspaces[id(node)].discard(subspace)
+
+            # remove the objectives no subspace refers to, from bottom to top.
+            while node is not None and not node.data.subspaces and not node.children:
+                parent = node.parent
+                del self._children[id(parent or self._tree)][node.data.name]
+                del self._nodes_by_pathname[self._pathnames.pop(id(node))]
+                del self._subspaces[id(node)]
+                self._children.pop(id(node), None)
+                self._nodes_by_name[node.data.name].remove(node)
+                if not self._nodes_by_name[node.data.name]:
+                    del self._nodes_by_name[node.data.name]
+                node.remove()
+                node = parent
+
+    def _patch(self, removed: list[Opath], added: list[Opath]):
+        """Update the tree in place after paths are moved in the subspaces directory.
+
+        Args:
+            removed (list[Opath]): Paths which no longer exist, with all
+                subspaces under them.
+            added (list[Opath]): Paths which are new, with all subspaces under them.
+        """
+
+        def is_changed(path: str) -> bool:
+            return any(path == p or path.startswith(p + os.sep) for p in changed)
+
+        changed = [str(p) for p in [*removed, *added]]
+        for subspace in [s for s in self._nodes_by_subspace if is_changed(str(s))]:
+            self._remove(subspace)
+        for path in [p for p in self._memo if is_changed(str(p))]:
+            del self._memo[path]
+        for dirpath in [d for d in self._scanner.listings if is_changed(d)]:
+            del self._scanner.listings[dirpath]
 
-                if node is None:
-                    node = node_iter.add(data)
-                else:
-                    node.data.subspaces = list(
-                        set(node.data.subspaces + data.subspaces)
-                    )
+        for path in added:
+            for subspace in self._scanner.scan(under=path):
+                self._add(subspace)
 
-                node_iter = node
+        # the parent directories have changed by the moves.
+        for dirpath in {os.path.dirname(p) for p in changed}:
+            if dirpath in self._scanner.listings:
+                self._scanner._list_dir(dirpath)
+
+    def is_stale(self, full: bool = True) -> bool:
+        """Check if the tree is outdated.
+
+        The tree is outdated when the subspaces settings in the profile have
+        changed, or any directory in the subspaces directory has changed since
+        it was scanned.
+
+        Args:
+            full (bool, optional): Check every directory listed, else only the
+                subspaces directory itself. Defaults to True.
+
+        Returns:
+            bool: True if the tree needs to be built again.
+        """
+        scanner = SubspaceScanner.from_omoospace(self.omoospace)
+        if scanner.settings != self._scanner.settings:
+            return True
+
+        if not full:
+            subspaces_dir = self._scanner.subspaces_dir
+            listing = self._scanner.listings.get(subspaces_dir)
+            try:
+                mtime = os.stat(subspaces_dir).st_mtime_ns
+            except OSError:
+                return listing is not None
+            return listing is None or listing[0] != mtime
+
+        for dirpath, mtime in self._scanner.mtimes().items():
+            try:
+                if os.stat(dirpath).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+
+        self._checked_at = time.monotonic()
+        return False
 
     def __contains__(self, name: str) -> bool:
         """Implement ``name in tree`` syntax to check for node existence."""
-        return bool(self._tree.find(match=lambda n: n.data.name == name))
+        return name in self._nodes_by_name
 
     def __len__(self):
         """Make ``len(tree)`` return the number of nodes
@@ -155,7 +449,7 @@ class ObjectiveTree:
     def __iter__(self):
         """Make ``for obj in tree`` iterate over all nodes."""
         iter = self._tree.__iter__()
-        return (Objective(n) for n in iter)
+        return (Objective(n, self) for n in iter)
 
     @property
     def count(self) -> int:
@@ -186,14 +480,10 @@ class ObjectiveTree:
             Objective: The found objective, or None if not found.
         """
 
-        n = self._tree.find(match=lambda node: node.data.name == name_or_pathname)
-        if n is None:
-            n = self._tree.find(
-                match=lambda node: node.path
-                == "/" + "/".join(name_or_pathname.split("_"))
-            )
+        nodes = self._nodes_by_name.get(name_or_pathname)
+        n = nodes[0] if nodes else self._nodes_by_pathname.get(name_or_pathname)
 
-        return Objective(n) if n else None
+        return Objective(n, self) if n else None
 
 
 class Subspace(Opath):
@@ -253,8 +543,7 @@ class Omoospace(Profile):
 
         for detect_path_parent in detect_path_parents:
             # Find a file named 'Omoospace' with any extension (or no extension)
-            candidates = list(Opath(detect_path_parent).glob("Omoospace.*"))
-            candidates = [c for c in candidates if c.is_file()]
+            candidates = _find_profile_files(str(detect_path_parent))
             if len(candidates) == 0:
                 continue
 
@@ -281,52 +570,68 @@ class Omoospace(Profile):
         Returns:
             list[NodeData]: The list of objective data extracted from the subspace.
         """
-        subspace = Opath(path).resolve()
-        omoospace = cls(subspace)
+        return cls.extract_path_data_many([path])[0]
 
-        if not omoospace.is_subspace(subspace):
-            raise ValueError(f"{subspace} is not a valid subspace.")
+    @classmethod
+    def extract_path_data_many(cls, paths: Iterable[AnyPath]) -> list[list[NodeData]]:
+        """Extract objective data from many subspaces.
 
-        # Get path parts. remove those directory that is not subspace.
-        subspaces = [subspace]
-        for parent in subspace.parents:
-            if omoospace.is_subspace(parent):
-                subspaces.append(parent)
-        subspaces.reverse()
+        Parent directories are checked and named once, and shared by all
+        the subspaces under them.
 
-        # init objectives list
-        objectives: list[NodeData] = []
+        Args:
+            paths (Iterable[AnyPath]): The subspaces to extract objectives from.
 
-        for subspace in subspaces:
-            prev_names = [d.name for d in objectives]
-            prev_count = len(prev_names)
+        Returns:
+            list[list[NodeData]]: The objective data of each subspace, in order.
+        """
+        memos: dict[Opath, dict[Opath, ObjectiveChain]] = {}
+        path_data_list = []
+        for path in paths:
+            subspace = Opath(path).resolve()
+            omoospace = cls(subspace)
 
-            # Normalize subspace name for objective name
-            subspace_name = normalize_name(subspace.stem)
+            if not omoospace.is_subspace(subspace):
+                raise ValueError(f"{subspace} is not a valid subspace.")
 
-            # Objective names are the strings that splited by "_".
-            # e.g. `Seq010_Shot0100.blend` has two objective (names): `Seq010` and `Shot0100`
-            names: list[str] = subspace_name.split("_")
+            memo = memos.setdefault(omoospace.root_dir, {})
+            path_data_list.append(omoospace._extract_path_data(subspace, memo))
 
-            # clip matched path names as mush as possible.
-            # e.g. path: ['Seq010'], enity name: `Seq010_Shot0100.blend`
-            # `Seq010` is the matched namespace, which will be cliped.
-            for i in range(prev_count):
-                suffix = "_".join(prev_names[i:])
-                prefix = "_".join(names[: prev_count - i])
-                if suffix == prefix:
-                    names = names[prev_count - i :]
-                    break
+        return path_data_list
 
-            # Append objective to list
-            for name in names:
-                objectives.append(NodeData(name, [subspace]))
+    def _extract_path_data(
+        self, subspace: Opath, memo: dict[Opath, ObjectiveChain]
+    ) -> list[NodeData]:
+        """Extract objective data from a subspace of this omoospace.
 
-            # Sometimes all namspaces are cliped. but still need to append subspace
-            if len(names) == 0:
-                objectives[-1].subspaces.append(subspace)
+        Args:
+            subspace (Opath): The subspace, an absolute path.
+            memo (dict[Opath, ObjectiveChain]): Objective chains of the parent
+                directories known so far, updated in place.
 
-        return objectives
+        Returns:
+            list[NodeData]: The list of objective data extracted from the subspace.
+        """
+        subspaces_dir = self.subspaces_dir
+
+        # Get the parents not known yet, remove those directory that is not subspace.
+        chain: ObjectiveChain = ()
+        parents: list[Opath] = []
+        for parent in subspace.parents:
+            if parent in memo:
+                chain = memo[parent]
+                break
+            if parent == subspaces_dir:
+                break
+            parents.append(parent)
+
+        for parent in reversed(parents):
+            if self.is_subspace(parent):
+                chain = _append_objectives(chain, parent)
+            memo[parent] = chain
+
+        chain = _append_objectives(chain, subspace)
+        return [NodeData(name, list(subspaces)) for name, subspaces in chain]
 
     @classmethod
     def extract_pathname(cls, path: AnyPath) -> str:
@@ -351,9 +656,22 @@ class Omoospace(Profile):
         Returns:
             Optional[Objective]: The wanted objective.
         """
-        pathname = cls.extract_pathname(path)
         omoospace = cls(path)
-        return omoospace.objective_tree.get(pathname)
+        with _tree_lock(str(omoospace.profile_file)):
+            tree = omoospace.objective_tree
+
+            # subspaces in the tree are known, without extracting again.
+            subspace = Opath(path).resolve()
+            nodes = tree._nodes_by_subspace.get(subspace)
+            if not nodes and omoospace.is_subspace(subspace):
+                # created since the tree was last checked in full.
+                tree = omoospace.refresh_objective_tree()
+                nodes = tree._nodes_by_subspace.get(subspace)
+            if nodes:
+                pathname = tree._pathnames[id(nodes[-1])]
+            else:
+                pathname = cls.extract_pathname(path)
+            return tree.get(pathname)
 
     @property
     def language(self) -> str:
@@ -442,44 +760,151 @@ class Omoospace(Profile):
     @property
     def subspaces(self) -> Oset[Subspace]:
         """Oset[Subspace]: the subspaces in the subspaces directory."""
-        return Oset(
-            [
-                Subspace(p)
-                for p in self.subspaces_dir.get_children()
-                if self.is_subspace(p)
-            ],
-            key="path",
-        )
+        return Oset(self.iter_subspaces(), key="path")
+
+    def iter_subspaces(self) -> Iterator[Subspace]:
+        """Discover the subspaces in the subspaces directory.
+
+        The profile settings are read once per call, and ignored directories
+        are skipped during the walk. With an index, only the directories
+        changed since it was saved are listed again.
+
+        Yields:
+            Subspace: The subspaces, as they are found.
+        """
+        scanner = SubspaceScanner.from_omoospace(self)
+        index = SubspaceIndex(self.root_dir)
+        stored = index.load(scanner.settings)
+        if not stored:
+            for path in scanner.scan():
+                yield Subspace(path)
+            return
+
+        scanner.listings, path_data = stored
+        mtimes = scanner.mtimes()
+        found = set()
+        for path in scanner.scan():
+            found.add(str(path))
+            yield Subspace(path)
+
+        if scanner.mtimes() != mtimes:
+            path_data = {p: d for p, d in path_data.items() if p in found}
+            index.save(scanner.settings, scanner.listings, path_data)
+
+    def watch(self, interval: float = 1.0) -> "Watcher":
+        """Watch the subspaces directory, and keep the objective tree up to date.
+
+        Args:
+            interval (float, optional): Seconds between polls. Defaults to 1.0.
+
+        Returns:
+            Watcher: The watcher, see `omoospace.watch.Watcher`.
+        """
+        from omoospace.watch import Watcher
+
+        return Watcher(self, interval=interval)
+
+    def create_index(self):
+        """Create a persistent subspace index in `.omoospace/index`.
+
+        Other processes opening this omoospace then load the subspaces and the
+        objective tree from the index, instead of scanning the subspaces
+        directory again.
+        """
+        index = SubspaceIndex(self.root_dir)
+        index.create()
+        with _tree_lock(str(self.profile_file)):
+            _cache_tree(str(self.profile_file), None)
+            self.objective_tree
+
+    def remove_index(self):
+        """Remove the persistent subspace index."""
+        SubspaceIndex(self.root_dir).remove()
 
     @property
     def objective_tree(self) -> ObjectiveTree:
-        """ObjectiveTree: The objective tree of this omoospace."""
-        return ObjectiveTree(self)
+        """ObjectiveTree: The objective tree of this omoospace.
 
-    def is_subspace(self, path: AnyPath, require_exists: bool = True) -> bool:
+        The tree is cached, and only built again when the subspaces settings
+        or the subspaces directory have changed. Changes deeper in the
+        subspaces directory are checked at most every `TREE_CHECK_INTERVAL`
+        seconds, see `refresh_objective_tree` to check them now.
+        """
+        cache_key = str(self.profile_file)
+        with _tree_lock(cache_key):
+            tree = _cached_tree(cache_key)
+            if tree is None or tree.is_stale(
+                full=time.monotonic() - tree._checked_at >= TREE_CHECK_INTERVAL
+            ):
+                tree = ObjectiveTree(self)
+                _cache_tree(cache_key, tree)
+            return tree
+
+    def refresh_objective_tree(self) -> ObjectiveTree:
+        """Check every directory in the subspaces directory for changes now,
+        and build the objective tree again if any has changed.
+
+        Returns:
+            ObjectiveTree: The objective tree.
+        """
+        cache_key = str(self.profile_file)
+        with _tree_lock(cache_key):
+            tree = _cached_tree(cache_key)
+            if tree is None or tree.is_stale():
+                tree = ObjectiveTree(self)
+                _cache_tree(cache_key, tree)
+            return tree
+
+    def _in_root(self, path: AnyPath, follow_symlinks: bool = False) -> Opath:
+        """Get the absolute path, spelled under the root directory if in it."""
+        path = _abspath(path, follow_symlinks)
+        root_dir = _abspath(self.root_dir, follow_symlinks)
+        if not _is_under(path, root_dir, or_equal=True):
+            # given through a symbolic link, or in another case.
+            path = _rebase(path, root_dir) or path
+        return Opath(path)
+
+    def is_subspace(
+        self, path: AnyPath, require_exists: bool = True, follow_symlinks=False
+    ) -> bool:
         """Check if a path is a subspace.
 
         Args:
             path (AnyPath): The path to check.
             require_exists (bool, optional): Whether to require the path to exist.
                 Defaults to True.
+            follow_symlinks (bool, optional): Resolve symbolic links in the
+                path first. Defaults to False.
 
         Returns:
             bool: True if the path is a subspace, False otherwise.
         """
-        path = Opath(path).resolve()
+        # Directories are made absolute once, then compared as strings.
+        path = self._in_root(path, follow_symlinks)
+        root_dir = _abspath(self.root_dir, follow_symlinks)
+        subspaces_dir = _abspath(self.subspaces_dir, follow_symlinks)
+        contents_dir = _abspath(self.contents_dir, follow_symlinks)
+        data_dir = os.path.join(root_dir, DATA_DIR)
 
         exists = path.exists() if require_exists else True
-        in_subspaces = path.is_under(self.subspaces_dir)
+        in_subspaces = _is_under(str(path), subspaces_dir)
+        # Omoospace.yml, or a profile folder like Omoospace.d and its files.
         not_profile_file = not (
-            path.name.startswith("Omoospace.") and path.parent == self.root_dir
+            _is_under(str(path), root_dir)
+            and path.relative_to(root_dir).parts[0].startswith("Omoospace.")
         )
         not_readme = "README.md" not in path.name
-        not_contents = not path.is_under(self.contents_dir, or_equal=True)
+        not_contents = not _is_under(str(path), contents_dir, or_equal=True)
+        not_data = not _is_under(str(path), data_dir, or_equal=True)
 
         # Early exit if basic conditions aren't met
         if not (
-            exists and in_subspaces and not_contents and not_profile_file and not_readme
+            exists
+            and in_subspaces
+            and not_contents
+            and not_data
+            and not_profile_file
+            and not_readme
         ):
             return False
 
@@ -488,41 +913,49 @@ class Omoospace(Profile):
         if not ignore:
             return True
 
-        n = path.relative_to(self.subspaces_dir).as_posix()
-        return not is_ignore(n, ignore)
+        n = path.relative_to(subspaces_dir).as_posix()
+        return not is_ignore(n, ignore, is_dir=path.is_dir())
 
-    def is_content(self, path: AnyPath, require_exists: bool = True) -> bool:
+    def is_content(
+        self, path: AnyPath, require_exists: bool = True, follow_symlinks=False
+    ) -> bool:
         """Check if path is contents item
 
         Args:
             path (AnyPath): Input path to check.
             require_exists (bool, optional): Whether to require the path to exist.
                 Defaults to True.
+            follow_symlinks (bool, optional): Resolve symbolic links in the
+                path first. Defaults to False.
 
         Returns:
             bool: True if the path is a content item, False otherwise.
         """
-        path = Opath(path).resolve()
+        path = self._in_root(path, follow_symlinks)
 
         exists = path.exists() if require_exists else True
-        in_contents = path.is_under(self.contents_dir)
+        in_contents = _is_under(str(path), _abspath(self.contents_dir, follow_symlinks))
 
         return exists and in_contents
 
-    def is_item(self, path: AnyPath, require_exists: bool = True) -> bool:
+    def is_item(
+        self, path: AnyPath, require_exists: bool = True, follow_symlinks=False
+    ) -> bool:
         """Check if path is this omoospace item.
 
         Args:
             path (AnyPath): Input path to check.
             require_exists (bool, optional): Whether to require the path to exist.
                 Defaults to True.
+            follow_symlinks (bool, optional): Resolve symbolic links in the
+                path first. Defaults to False.
 
         Returns:
             bool: True if the path is an Omoospace item, False otherwise.
         """
-        path = Opath(path).resolve()
+        path = self._in_root(path, follow_symlinks)
         exists = path.exists() if require_exists else True
-        in_omoospace = path.is_under(self.root_dir)
+        in_omoospace = _is_under(str(path), _abspath(self.root_dir, follow_symlinks))
         not_profile_file = "Omoospace." not in path.name
 
         return exists and in_omoospace and not_profile_file
@@ -552,44 +985,56 @@ class Omoospace(Profile):
         if subspace.is_dir():
             raise FileExistsError(f"{subspace} already exists.")
 
-        # create subspace folder
-        try:
-            make_path(
-                f"{subspace_name}/",
-                under=parent_path,
-            )
-        except Exception as err:
-            raise err
-
-        # collect children that matched.
-        if collect_children:
-            children = parent_path.get_children(recursive=False)
-
-            def is_match(child: Opath):
-                not_itself = child.name != subspace_name
-                is_match = False
-
-                child_node_names = normalize_name(child.name).split("_")
-                subspace_node_names = subspace_name.split("_")
-                for i in range(len(subspace_node_names)):
-                    subspace_suffix = "_".join(subspace_node_names[i:])
-                    child_prefix = "_".join(
-                        child_node_names[: len(subspace_node_names) - i]
-                    )
-                    if subspace_suffix == child_prefix:
-                        is_match = True
-                        break
-
-                return not_itself and is_match
-
-            # Remove subspace that not match the name
-            children = list(filter(is_match, children))
-
-            for child in children:
-                try:
-                    child.move_to(subspace)
-                except Exception as err:
-                    raise err
+        # the tree is patched along, other threads wait for it.
+        with _tree_lock(str(self.profile_file)):
+            # the cached tree will be patched if it is up to date.
+            tree = _cached_tree(str(self.profile_file))
+            if tree is not None and tree.is_stale():
+                tree = None
+
+            # create subspace folder
+            try:
+                make_path(
+                    f"{subspace_name}/",
+                    under=parent_path,
+                )
+            except Exception as err:
+                raise err
+
+            # collect children that matched.
+            if collect_children:
+                def is_match(child: Opath):
+                    not_itself = child.name != subspace_name
+                    is_match = False
+
+                    child_node_names = normalize_name(child.name).split("_")
+                    subspace_node_names = subspace_name.split("_")
+                    for i in range(len(subspace_node_names)):
+                        subspace_suffix = "_".join(subspace_node_names[i:])
+                        child_prefix = "_".join(
+                            child_node_names[: len(subspace_node_names) - i]
+                        )
+                        if subspace_suffix == child_prefix:
+                            is_match = True
+                            break
+
+                    return not_itself and is_match
+
+                # Remove subspace that not match the name
+                children = parent_path.iter_children(
+                    max_depth=1, prune=lambda entry: entry.name == DATA_DIR
+                )
+                children = [child for child in children if is_match(child)]
+
+                for child in children:
+                    try:
+                        child.move_to(subspace)
+                    except Exception as err:
+                        raise err
+
+            if tree is not None:
+                moved = children if collect_children else []
+                tree._patch(removed=moved, added=[subspace])
 
         if reveal_in_explorer:
             subspace.reveal_in_explorer()
@@ -612,11 +1057,12 @@ class Omoospace(Profile):
         Args:
             note (str): Note content.
         """
-        notes_dict = self.get("notes") or {}
-        nodes = self.get_note(scope)
+        with self.batch():
+            notes_dict = self.get("notes") or {}
+            nodes = self.get_note(scope)
 
-        notes_dict[scope] = nodes + [note]
-        self.set("notes", notes_dict)
+            notes_dict[scope] = nodes + [note]
+            self.set("notes", notes_dict)
 
     def get_maker(self, name: str) -> Optional[Maker]:
         """Get maker by name."""
@@ -630,6 +1076,28 @@ class Omoospace(Profile):
         """Remove maker."""
         (c := self.get_maker(name)) and c.remove()
 
+    def add_makers(self, makers: Iterable[Union[str, MakerDict, Maker]]) -> list[Maker]:
+        """Add makers if not exist, with one profile write.
+
+        All makers are validated first, nothing is added if one is not valid.
+
+        Args:
+            makers (Iterable[Union[str, MakerDict, Maker]]): The makers.
+
+        Returns:
+            list[Maker]: The added makers.
+        """
+        makers = list(makers)
+        for maker in makers:
+            Maker.validate(maker)
+
+        with self.batch():
+            return [Maker(self, maker) for maker in makers]
+
+    def remove_makers(self, names: Iterable[Union[str, Maker]]):
+        """Remove makers, with one profile write."""
+        self._remove_items("makers", names)
+
     def get_tool(self, name: str) -> Optional[Tool]:
         """Get Tool by name."""
         return self.tools.get(name)
@@ -643,6 +1111,28 @@ class Omoospace(Profile):
         # Update profile
         (t := self.get_tool(name)) and t.remove()
 
+    def add_tools(self, tools: Iterable[Union[str, ToolDict, Tool]]) -> list[Tool]:
+        """Add tools if not exist, with one profile write.
+
+        All tools are validated first, nothing is added if one is not valid.
+
+        Args:
+            tools (Iterable[Union[str, ToolDict, Tool]]): The tools.
+
+        Returns:
+            list[Tool]: The added tools.
+        """
+        tools = list(tools)
+        for tool in tools:
+            Tool.validate(tool)
+
+        with self.batch():
+            return [Tool(self, tool) for tool in tools]
+
+    def remove_tools(self, names: Iterable[Union[str, Tool]]):
+        """Remove tools, with one profile write."""
+        self._remove_items("tools", names)
+
     def get_work(self, name: str) -> Optional[Work]:
         """Get Work by name."""
         return self.works.get(name)
@@ -667,3 +1157,40 @@ class Omoospace(Profile):
         """Remove work from this omoospace."""
         # Update profile
         (w := self.get_work(name)) and w.remove()
+
+    def add_works(
+        self, works: Iterable[Union[list[str], str, WorkDict, Work]]
+    ) -> list[Work]:
+        """Add works if not exist, with one profile write.
+
+        All works are validated first, nothing is added if one is not valid.
+
+        Args:
+            works (Iterable[Union[list[str], str, WorkDict, Work]]): The works,
+                each as accepted by `add_work`, a list for its contents.
+
+        Returns:
+            list[Work]: The added works.
+        """
+        works = [work if isinstance(work, list) else [work] for work in works]
+        for work in works:
+            if not (work and all(isinstance(arg, str) for arg in work)):
+                Work.validate(work[0] if len(work) == 1 else work)
+
+        with self.batch():
+            return [self.add_work(*work) for work in works]
+
+    def remove_works(self, names: Iterable[Union[str, Work]]):
+        """Remove works, with one profile write."""
+        self._remove_items("works", names)
+
+    def _remove_items(
+        self, dict_name: str, names: Iterable[Union[str, Maker, Tool, Work]]
+    ):
+        """Remove items by name from a profile dictionary, e.g. makers."""
+        names = {getattr(name, "name", name) for name in names}
+        with self.batch():
+            items = self._peek(dict_name)
+            if not isinstance(items, dict) or not names & items.keys():
+                return
+            self.set(dict_name, {k: v for k, v in items.items() if k not in names})
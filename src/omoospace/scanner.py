@@ -0,0 +1,218 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Optional, Union
+
+from omoospace.utils import AnyPath, Opath
+from omoospace.validators import IgnoreMatcher
+
+# Folder in the omoospace root for data kept by omoospace itself.
+DATA_DIR = ".omoospace"
+
+# A directory entry as (name, is_dir, is_symlink).
+Entry = tuple[str, bool, bool]
+
+
+class SubspaceScanner:
+    """Single-pass subspace discovery built on ``os.scandir``.
+
+    The scanner snapshots the directory settings and ignore patterns once,
+    then walks the subspaces directory top-down. Ignored directories and the
+    contents directory are pruned during the walk, so nothing below them is
+    ever listed.
+
+    Usage:
+    ```python
+    scanner = SubspaceScanner.from_omoospace(omoospace)
+    for path in scanner.scan():
+        print(path)
+    ```
+    """
+
+    def __init__(
+        self,
+        root_dir: AnyPath,
+        subspaces_dir: AnyPath,
+        contents_dir: AnyPath,
+        ignore: Optional[Union[str, list[str]]] = None,
+        workers: Optional[int] = None,
+    ):
+        """Initialize a scanner.
+
+        Args:
+            root_dir (AnyPath): Omoospace root directory.
+            subspaces_dir (AnyPath): Directory to discover subspaces in.
+            contents_dir (AnyPath): Contents directory, never scanned.
+            ignore (Union[str, list[str]], optional): Ignore patterns relative
+                to ``subspaces_dir``. Defaults to None.
+            workers (int, optional): Threads listing directories at once, for
+                network storage. Defaults to None, listing one by one.
+        """
+        self.root_dir = os.path.abspath(root_dir)
+        self.subspaces_dir = os.path.abspath(subspaces_dir)
+        self.contents_dir = os.path.abspath(contents_dir)
+        self.ignore = ignore or []
+        self.ignore_matcher = IgnoreMatcher(self.ignore)
+        self.workers = max(int(workers or 1), 1)
+        self.data_dir = os.path.join(self.root_dir, DATA_DIR)
+
+        # Listings of the directories walked so far, keyed by path, as
+        # (st_mtime_ns, entries). A listing is reused while the directory's
+        # modification time is unchanged, so listings can be given up front.
+        self.listings: dict[str, tuple[int, list[Entry]]] = {}
+
+    @classmethod
+    def from_omoospace(cls, omoospace: "Omoospace") -> "SubspaceScanner":
+        """Create a scanner from the current settings of an omoospace.
+
+        Args:
+            omoospace (Omoospace): The omoospace to scan.
+
+        Returns:
+            SubspaceScanner: The scanner.
+        """
+        return cls(
+            omoospace.root_dir,
+            omoospace.subspaces_dir,
+            omoospace.contents_dir,
+            omoospace.get("ignore"),
+            omoospace.get("scan_workers"),
+        )
+
+    @property
+    def settings(self) -> tuple:
+        """tuple: The settings which decide what is found, for comparison."""
+        ignore = [self.ignore] if isinstance(self.ignore, str) else self.ignore
+        return (self.root_dir, self.subspaces_dir, self.contents_dir, tuple(ignore))
+
+    def mtimes(self) -> dict[str, int]:
+        """Get the modification times of the directories listed.
+
+        Returns:
+            dict[str, int]: ``st_mtime_ns`` keyed by directory path.
+        """
+        return {dirpath: mtime for dirpath, (mtime, _) in self.listings.items()}
+
+    def _is_excluded(
+        self, path: str, is_dir: bool, parents_checked: bool = True
+    ) -> bool:
+        """Whether a path is skipped, and not descended into."""
+        if path == self.contents_dir or path == self.data_dir:
+            return True
+
+        # The profile's own folders, e.g. the shard files in Omoospace.d
+        dirpath, name = os.path.split(path)
+        if is_dir and dirpath == self.root_dir and name.startswith("Omoospace."):
+            return True
+
+        if self.ignore_matcher:
+            relpath = os.path.relpath(path, self.subspaces_dir).replace(os.sep, "/")
+            if parents_checked:
+                return self.ignore_matcher.match_entry(relpath, is_dir=is_dir)
+            return self.ignore_matcher.match(relpath, is_dir=is_dir)
+
+        return False
+
+    def _is_listed(self, dirpath: str, name: str) -> bool:
+        """Whether a not excluded path is a subspace itself."""
+        is_profile_file = name.startswith("Omoospace.") and dirpath == self.root_dir
+        is_readme = "README.md" in name
+        return not (is_profile_file or is_readme)
+
+    def _list_dir(self, dirpath: str) -> list[Entry]:
+        """List a directory, or reuse its listing if it has not changed."""
+        try:
+            mtime = os.stat(dirpath).st_mtime_ns
+            cached = self.listings.get(dirpath)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+            entries = []
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append((entry.name, is_dir, entry.is_symlink()))
+        except OSError:
+            self.listings.pop(dirpath, None)
+            return []
+
+        # Sorted, so that the output doesn't depend on the file system.
+        entries.sort()
+
+        self.listings[dirpath] = (mtime, entries)
+        return entries
+
+    def scan(self, under: AnyPath = None) -> Iterator[Opath]:
+        """Walk the subspaces directory and yield subspace paths as found.
+
+        Args:
+            under (AnyPath, optional): Only walk this directory in the subspaces
+                directory, which is yielded first if it's a subspace itself.
+                Defaults to None.
+
+        Returns:
+            Iterator[Opath]: Absolute paths of the subspaces.
+        """
+        # Contents directory wraps the subspaces directory, nothing to find.
+        if (self.subspaces_dir + os.sep).startswith(self.contents_dir + os.sep):
+            return
+
+        top = self.subspaces_dir
+        if under is not None:
+            top = os.path.abspath(under)
+            if top != self.subspaces_dir:
+                if self._is_excluded(top, os.path.isdir(top), parents_checked=False):
+                    return
+                dirpath, name = os.path.split(top)
+                if os.path.exists(top) and self._is_listed(dirpath, name):
+                    yield Opath(top)
+
+        # Directories are visited depth-first, in name order. With workers,
+        # the subdirectories are listed ahead in the pool as soon as their
+        # parent is, so sibling directories are listed at once.
+        pool = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            yield from self._walk(top, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def _walk(self, top: str, pool: Optional[ThreadPoolExecutor]) -> Iterator[Opath]:
+        """Walk from a directory, listing ahead in the pool if any."""
+
+        def list_ahead(dirpath: str) -> Optional[Future]:
+            return pool.submit(self._list_dir, dirpath) if pool else None
+
+        stack = [(top, list_ahead(top))] if os.path.isdir(top) else []
+        visited = set()
+        while stack:
+            dirpath, listing = stack.pop()
+            visited.add(dirpath)
+
+            entries = listing.result() if listing else self._list_dir(dirpath)
+            subdirs = []
+            for name, is_dir, is_symlink in entries:
+                path = os.path.join(dirpath, name)
+
+                # Parents are not ignored, or they would not be listed.
+                if self._is_excluded(path, is_dir):
+                    continue
+
+                # Skip dangling symbolic links.
+                if is_symlink and not os.path.exists(path):
+                    continue
+
+                if self._is_listed(dirpath, name):
+                    yield Opath(path)
+
+                if is_dir:
+                    subdirs.append((path, list_ahead(path)))
+
+            stack.extend(reversed(subdirs))
+
+        # Forget the directories which are gone or no longer walked.
+        if top == self.subspaces_dir:
+            for dirpath in set(self.listings) - visited:
+                del self.listings[dirpath]
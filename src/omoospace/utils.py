@@ -2,12 +2,20 @@ import re
 import os
 import sys
 import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Generic, Iterable, Optional, TypeVar, Union
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
 
-from pypinyin import lazy_pinyin
-from ruamel.yaml import YAML
 from omoospace.validators import (
     is_autosave,
     is_number,
@@ -17,13 +25,100 @@ from omoospace.validators import (
 )
 from omoospace import pyperclip
 
-yaml = YAML()
-yaml.indent(sequence=4, offset=2)
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML
+
+
+# ruamel.yaml and pypinyin are slow to import, they are imported on first use
+# so that importing omoospace stays cheap.
+@lru_cache(maxsize=None)
+def get_yaml() -> "YAML":
+    """Get the shared round-trip YAML instance, created on first use.
+
+    Returns:
+        YAML: The YAML instance.
+    """
+    from ruamel.yaml import YAML
+
+    yaml = YAML()
+    yaml.indent(sequence=4, offset=2)
+    return yaml
+
+
+@lru_cache(maxsize=None)
+def get_safe_yaml() -> "YAML":
+    """Get the shared safe YAML instance, created on first use.
+
+    It loads plain Python objects, with the C loader when available, and is
+    much faster than round-trip loading. Use it for reading only, comments
+    and formatting are not kept.
+
+    Returns:
+        YAML: The YAML instance.
+    """
+    from ruamel.yaml import YAML
+
+    return YAML(typ="safe")
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from omoospace.utils import yaml` working.
+    if name == "yaml":
+        return get_yaml()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 NativePath = Path().__class__
 
 
+def _abspath(path: Union[str, Path], follow_symlinks: bool = False) -> str:
+    """Get the absolute, normalized path string, in the caller's case.
+
+    Without following symbolic links, this is pure string work on absolute
+    paths.
+    """
+    return os.path.realpath(path) if follow_symlinks else os.path.abspath(path)
+
+
+def _is_under(a: str, b: str, or_equal: bool = False) -> bool:
+    """Whether the path string a is under b, both from `_abspath`.
+
+    The case is only ignored in the comparison, where the system does.
+    """
+    a = os.path.normcase(a)
+    b = os.path.normcase(b)
+    if a == b:
+        return or_equal
+    return a.startswith(b if b.endswith(os.sep) else b + os.sep)
+
+
+def _rebase(a: str, b: str) -> Optional[str]:
+    """Spell the path a under b, if one of its parents is b on the file system.
+
+    The fallback for the string comparison of `_is_under`, for paths given
+    through a symbolic link or in another case.
+
+    Returns:
+        Optional[str]: The path under b, None if not under it.
+    """
+    try:
+        b_stat = os.stat(b)
+    except OSError:
+        return None
+    parent, names = a, []
+    while True:
+        try:
+            if os.path.samestat(os.stat(parent), b_stat):
+                return os.path.join(b, *reversed(names))
+        except OSError:
+            pass
+        head, name = os.path.split(parent)
+        if head == parent:
+            return None
+        names.append(name)
+        parent = head
+
+
 class Opath(NativePath):
     """
     Custom Path class, inherit from system native Path class,
@@ -39,42 +134,99 @@ class Opath(NativePath):
         else:  # Linux/Unix
             os.system(f"xdg-open '{self.as_posix()}'")
 
-    def is_under(self, b: Union[str, Path, "Opath"], or_equal=False) -> bool:
+    def is_under(
+        self, b: Union[str, Path, "Opath"], or_equal=False, follow_symlinks=False
+    ) -> bool:
         """Return True if a is a subpath of b .
 
+        Paths are compared as absolute, normalized strings. Only if a is not
+        under b that way, its parents are compared with b on the file system.
+
         Args:
             b (Union[str, Path]): Parent path
-            or_equal (bool, optional): [description]. Defaults to False.
+            or_equal (bool, optional): Also True if a is b. Defaults to False.
+            follow_symlinks (bool, optional): Resolve symbolic links in both
+                paths first. Defaults to False.
 
         Returns:
             bool: Result.
         """
-        b = Path(b).resolve()
-        a = self.resolve()
-        is_under = b in a.parents
-        is_equal = b == a
-
-        return is_under or is_equal if or_equal else is_under
-
-    def get_children(self, recursive: bool = True) -> list["Opath"]:
+        a = _abspath(self, follow_symlinks)
+        b = _abspath(b, follow_symlinks)
+        if _is_under(a, b, or_equal=True):
+            return _is_under(a, b, or_equal)
+        a = _rebase(a, b)
+        return a is not None and _is_under(a, b, or_equal)
+
+    def get_children(
+        self, recursive: bool = True, follow_symlinks: bool = False
+    ) -> list["Opath"]:
         """Get all paths in giving directory.
 
         Args:
             recursive (bool, optional): Whether recursive or not. Defaults to True.
+            follow_symlinks (bool, optional): Resolve symbolic links in the
+                paths. Defaults to False.
         """
-        search_path: Path = self.resolve()
-        paths: list[Opath] = []
-        if recursive:
-            # FIXME: replace this with Path.walk (python 3.12)
-            # https://docs.python.org/3/library/pathlib.html
-            for root, dirs, files in os.walk(search_path):
-                for path in [*dirs, *files]:
-                    child = Opath(root, path).resolve()
-                    paths.append(child)
-        else:
-            for child in search_path.iterdir():
-                paths.append(child)
-        return paths
+        search_path = Opath(_abspath(self, follow_symlinks))
+        if not recursive:
+            return [Opath(child) for child in search_path.iterdir()]
+        if follow_symlinks:
+            return [child.resolve() for child in search_path.iter_children()]
+        return list(search_path.iter_children())
+
+    def iter_children(
+        self,
+        max_depth: Optional[int] = None,
+        prune: Optional[Callable[[os.DirEntry], bool]] = None,
+        entries: bool = False,
+        follow_symlinks: bool = False,
+    ) -> Iterator[Union["Opath", os.DirEntry]]:
+        """Iterate the paths in this directory, as they are listed.
+
+        The entries of a directory are yielded before the ones in its
+        subdirectories. Nothing is collected or resolved, so the caller can
+        stop at any time.
+
+        Args:
+            max_depth (int, optional): How deep to go, 1 for the direct
+                children only. Defaults to None, no limit.
+            prune (Callable[[os.DirEntry], bool], optional): Called with each
+                entry, if it returns True the entry and everything under it
+                are skipped. Defaults to None.
+            entries (bool, optional): Yield the `os.DirEntry` objects, with
+                their cached file type, instead of Opath. Defaults to False.
+            follow_symlinks (bool, optional): Walk into symbolic links to
+                directories. Defaults to False.
+
+        Yields:
+            Union[Opath, os.DirEntry]: The paths under this directory.
+        """
+        stack = [(os.fspath(self), 1)]
+        while stack:
+            dirpath, depth = stack.pop()
+            try:
+                with os.scandir(dirpath) as it:
+                    listed = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in listed:
+                if prune is not None and prune(entry):
+                    continue
+
+                yield entry if entries else Opath(entry.path)
+
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        subdirs.append((entry.path, depth + 1))
+                except OSError:
+                    continue
+
+            stack.extend(reversed(subdirs))
 
     def copy_to(
         self, dir: Union[str, Path, "Opath"], overwrite: bool = False
@@ -158,26 +310,30 @@ class Opath(NativePath):
 AnyPath = Union[str, Path, Opath]
 
 
-def normalize_name(name: str, chinese_to_pinyin: bool = False) -> str:
-    def is_semantic(s: str):
-        return not (
-            is_number(s)
-            or is_version(s)
-            or is_autosave(s)
-            or is_recovered(s)
-            or is_buckup(s)
-        )
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_NOT_WORD_PATTERN = re.compile(r"[^\w-]")
+
+
+def _is_semantic(s: str) -> bool:
+    return not (
+        is_number(s) or is_version(s) or is_autosave(s) or is_recovered(s) or is_buckup(s)
+    )
 
+
+@lru_cache(maxsize=8192)
+def _normalize_name(name: str, chinese_to_pinyin: bool) -> str:
     # Remove everything after the first "."
     name = name.split(".", 1)[0]
 
     result_parts = []
     for part in name.split("_"):
-        words = [w for w in re.split(r"\s+", part) if is_semantic(w)]
+        words = [w for w in _WHITESPACE_PATTERN.split(part) if _is_semantic(w)]
         if not words:
             continue
-        cleaned = re.sub(r"[^\w-]", " ", " ".join(words))
+        cleaned = _NOT_WORD_PATTERN.sub(" ", " ".join(words))
         if chinese_to_pinyin:
+            from pypinyin import lazy_pinyin
+
             cleaned = " ".join(lazy_pinyin(cleaned))
         # PascalCase: preserve original capitalization for multi-letter words, single letters uppercase
         pascal = ""
@@ -197,6 +353,45 @@ def normalize_name(name: str, chinese_to_pinyin: bool = False) -> str:
     return normalized
 
 
+def normalize_name(name: str, chinese_to_pinyin: bool = False) -> str:
+    """Normalize a name to PascalCase words joined by "_".
+
+    Results are memoized, the same name is only normalized once.
+
+    Args:
+        name (str): The name, like a file stem.
+        chinese_to_pinyin (bool, optional): Convert Chinese to pinyin.
+            Defaults to False.
+
+    Returns:
+        str: The normalized name.
+    """
+    return _normalize_name(name, bool(chinese_to_pinyin))
+
+
+def normalize_names(
+    names: Iterable[str], chinese_to_pinyin: bool = False
+) -> list[str]:
+    """Normalize many names at once, like all the stems found in a scan.
+
+    Args:
+        names (Iterable[str]): The names.
+        chinese_to_pinyin (bool, optional): Convert Chinese to pinyin.
+            Defaults to False.
+
+    Returns:
+        list[str]: The normalized names, in the same order.
+    """
+    chinese_to_pinyin = bool(chinese_to_pinyin)
+    normalized: dict[str, str] = {}
+    results = []
+    for name in names:
+        if name not in normalized:
+            normalized[name] = _normalize_name(name, chinese_to_pinyin)
+        results.append(normalized[name])
+    return results
+
+
 def remove_duplicates(list, key):
     seen = set()
     new_list = []
@@ -281,6 +476,9 @@ class Oset(Generic[T], set):
     Attributes:
         key: Name of attribute used for uniqueness checks on custom objects (default: "name")
              Ignored for primitive type elements
+
+    Elements are indexed by their key, which is computed once per element, so
+    membership checks, lookups, additions and removals are O(1).
     """
 
     def __init__(self, iterable: Iterable[T] = (), key: str = "name"):
@@ -295,16 +493,14 @@ class Oset(Generic[T], set):
             ValueError: If custom objects lack the specified key attribute
         """
         self.key = key
-        unique_items = []
-        seen_keys = set()
+        self._items: dict[Union[str, int, float, bool], T] = {}
 
         for item in iterable:
             item_key = self._get_item_key(item)
-            if item_key not in seen_keys:
-                seen_keys.add(item_key)
-                unique_items.append(item)
+            if item_key not in self._items:
+                self._items[item_key] = item
 
-        super().__init__(unique_items)
+        super().__init__(self._items.values())
 
     def _get_item_key(self, item: T) -> Union[str, int, float, bool]:
         """
@@ -329,6 +525,18 @@ class Oset(Generic[T], set):
         except AttributeError:
             raise ValueError(f"Object {item} missing required attribute '{self.key}'")
 
+    def __reduce__(self):
+        return (self.__class__, (list(self._items.values()), self.key))
+
+    def _find_key(self, item: Any) -> Optional[Union[str, int, float, bool]]:
+        """Get the key of an element in the set by attribute value or object,
+        or None if it is not found."""
+        try:
+            item_key = self._get_item_key(item)
+        except ValueError:
+            return None
+        return item_key if item_key in self._items else None
+
     def __contains__(self, item: Any) -> bool:
         """
         Override membership operator ('in') with type-aware logic.
@@ -343,23 +551,7 @@ class Oset(Generic[T], set):
         Returns:
             bool: True if item exists in set, False otherwise
         """
-        # Check if collection contains custom objects (not primitives)
-        if self and not isinstance(next(iter(self)), (str, int, float, bool)):
-            # Case 1: Check by attribute value (e.g., "Alice" for Maker object)
-            if isinstance(item, (str, int, float, bool)):
-                return any(self._get_item_key(obj) == item for obj in self)
-
-            # Case 2: Check by object instance (compare key attributes)
-            else:
-                try:
-                    item_key = self._get_item_key(item)
-                    print(item_key)
-                except ValueError:
-                    return False
-                return any(self._get_item_key(obj) == item_key for obj in self)
-        # Primitive type collection - use native set behavior
-        else:
-            return super().__contains__(item)
+        return self._find_key(item) is not None
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -405,7 +597,8 @@ class Oset(Generic[T], set):
             ValueError: If custom object lacks the specified key attribute
         """
         item_key = self._get_item_key(item)
-        if item_key not in self:
+        if item_key not in self._items:
+            self._items[item_key] = item
             super().add(item)
 
     def update(self, *iterables: Iterable[T]) -> None:
@@ -424,6 +617,58 @@ class Oset(Generic[T], set):
             for item in iterable:
                 self.add(item)
 
+    def __ior__(self, other: Iterable[T]) -> "Oset[T]":
+        self.update(other)
+        return self
+
+    def difference_update(self, *iterables: Iterable[Any]) -> None:
+        """
+        Remove all elements found in one or more iterables, by attribute value or object.
+
+        Args:
+            iterables: One or more iterables containing attribute values/objects
+        """
+        for iterable in iterables:
+            for item in iterable:
+                self.discard(item)
+
+    def __isub__(self, other: Iterable[Any]) -> "Oset[T]":
+        self.difference_update(other)
+        return self
+
+    def intersection_update(self, *iterables: Iterable[Any]) -> None:
+        """
+        Keep only the elements found in all the iterables, by attribute value or object.
+
+        Args:
+            iterables: One or more iterables containing attribute values/objects
+        """
+        for iterable in iterables:
+            other = Oset(iterable, key=self.key)
+            for item_key in [k for k in self._items if k not in other]:
+                self.discard(item_key)
+
+    def __iand__(self, other: Iterable[Any]) -> "Oset[T]":
+        self.intersection_update(other)
+        return self
+
+    def symmetric_difference_update(self, other: Iterable[T]) -> None:
+        """
+        Keep the elements found in either the set or the iterable, but not both.
+
+        Args:
+            other: Iterable containing primitives/objects
+        """
+        for item in Oset(other, key=self.key):
+            if item in self:
+                self.discard(item)
+            else:
+                self.add(item)
+
+    def __ixor__(self, other: Iterable[T]) -> "Oset[T]":
+        self.symmetric_difference_update(other)
+        return self
+
     def get(self, item: Any) -> Optional[T]:
         """
         Look up and return an element from the set.
@@ -439,26 +684,8 @@ class Oset(Generic[T], set):
         Returns:
             Optional[T]: Found element (primitive/object) or None if not found
         """
-        # Custom object collection lookup
-        if self and not isinstance(next(iter(self)), (str, int, float, bool)):
-            if isinstance(item, (str, int, float, bool)):
-                for obj in self:
-                    if self._get_item_key(obj) == item:
-                        return obj
-            else:
-                try:
-                    item_key = self._get_item_key(item)
-                except ValueError:
-                    return None
-                for obj in self:
-                    if self._get_item_key(obj) == item_key:
-                        return obj
-        # Primitive collection lookup
-        else:
-            for obj in self:
-                if obj == item:
-                    return obj
-        return None
+        item_key = self._find_key(item)
+        return None if item_key is None else self._items[item_key]
 
     def remove(self, item: Any) -> None:
         """
@@ -472,10 +699,10 @@ class Oset(Generic[T], set):
         Raises:
             KeyError: If element is not found in the set
         """
-        target_item = self.get(item)
-        if target_item is None:
+        item_key = self._find_key(item)
+        if item_key is None:
             raise KeyError(item)
-        super().remove(target_item)
+        super().remove(self._items.pop(item_key))
 
     def discard(self, item: Any) -> None:
         """
@@ -486,9 +713,9 @@ class Oset(Generic[T], set):
         Args:
             item: Attribute value (str/int) or object to remove
         """
-        target_item = self.get(item)
-        if target_item is not None:
-            super().discard(target_item)
+        item_key = self._find_key(item)
+        if item_key is not None:
+            super().discard(self._items.pop(item_key))
 
     def pop(self) -> T:
         """
@@ -502,10 +729,13 @@ class Oset(Generic[T], set):
         """
         if not self:
             raise KeyError("pop from empty Oset")
-        return super().pop()
+        item_key, item = self._items.popitem()
+        super().discard(item)
+        return item
 
     def clear(self) -> None:
         """Remove all elements from the set."""
+        self._items.clear()
         super().clear()
 
     def to_set(self) -> set[Union[str, int, float, bool]]:
@@ -518,4 +748,4 @@ class Oset(Generic[T], set):
         Returns:
             set: Standard set containing primitive values or object key attributes
         """
-        return {self._get_item_key(item) for item in self}
+        return set(self._items)
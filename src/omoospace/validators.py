@@ -1,24 +1,50 @@
-import fnmatch
+import os
+from functools import lru_cache
 from pathlib import Path
 import re
-from typing import List, Union
+from typing import List, Optional, Union
+
+
+# Patterns are compiled once, validators run for every word of every name.
+_NUMBER_PATTERN = re.compile(r"^-?\d+(?:\.\d+)?$")
+_EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+_URL_PATTERN = re.compile(
+    r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+)
+_PURE_TAG_PATTERN = re.compile(
+    r"^(alpha|beta|rc|stable|latest|pre-alpha)$", re.IGNORECASE
+)
+_RANGE_PREFIX_PATTERN = re.compile(r"^(>=|<=|\^|~)")
+# 合法的核心版本号规则：
+# - 要么是 v+纯数字（如v4、v001）
+# - 要么是 包含至少一个小数点的数字（如4.2、0.1.0）
+# - 支持可选的预发布标签（如0.1.0-alpha）
+_CORE_VERSION_PATTERN = re.compile(
+    r"""
+    ^                                           # 字符串开头
+    (?:v\d+)                                    # 带v前缀的单数字（v4、v001）
+    |                                           # 或
+    (?:\d+(?:\.\d+)+)                           # 包含至少一个小数点的数字（4.2、0.1.0）
+    (?:-(?:alpha|beta|rc|stable|latest|pre-alpha))?  # 可选的预发布标签
+    $                                           # 字符串结尾
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+_AUTOSAVE_PATTERN = re.compile(r"auto[-_\s]?save", re.IGNORECASE)
+_BUCKUP_PATTERN = re.compile(r"^bak\d*$|^backup$", re.IGNORECASE)
+_RECOVERED_PATTERN = re.compile(r"^recovered$", re.IGNORECASE)
 
 
 def is_number(string):
-    pattern = r"^-?\d+(?:\.\d+)?$"
-    return bool(re.match(pattern, string))
+    return bool(_NUMBER_PATTERN.match(string))
 
 
 def is_email(string):
-    pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-    return bool(re.match(pattern, string))
+    return bool(_EMAIL_PATTERN.match(string))
 
 
 def is_url(string):
-    pattern = re.compile(
-        r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
-    )
-    return bool(re.match(pattern, string))
+    return bool(_URL_PATTERN.match(string))
 
 
 def is_version(string: str) -> bool:
@@ -27,8 +53,7 @@ def is_version(string: str) -> bool:
         return False
 
     # 1. 处理纯预发布标签的情况（beta/stable/latest/pre-alpha等）
-    pure_tag_pattern = r"^(alpha|beta|rc|stable|latest|pre-alpha)$"
-    if re.match(pure_tag_pattern, string, re.IGNORECASE):
+    if _PURE_TAG_PATTERN.match(string):
         return True
 
     # 2. 处理版本范围表达式（包含,分隔的多个版本条件）
@@ -40,7 +65,7 @@ def is_version(string: str) -> bool:
 
     # 3. 处理带版本范围符号的单版本（>=、<=、^、~ 开头）
     range_prefix = None
-    range_prefix_match = re.match(r"^(>=|<=|\^|~)", string)
+    range_prefix_match = _RANGE_PREFIX_PATTERN.match(string)
     if range_prefix_match:
         range_prefix = range_prefix_match.group(1)
         core_version = string[len(range_prefix) :]  # 提取范围符号后的核心版本号
@@ -48,44 +73,201 @@ def is_version(string: str) -> bool:
         core_version = string  # 无范围符号，核心版本号就是原字符串
 
     # 4. 校验核心版本号的格式
-    # 合法的核心版本号规则：
-    # - 要么是 v+纯数字（如v4、v001）
-    # - 要么是 包含至少一个小数点的数字（如4.2、0.1.0）
-    # - 支持可选的预发布标签（如0.1.0-alpha）
-    core_pattern = r"""
-        ^                                           # 字符串开头
-        (?:v\d+)                                    # 带v前缀的单数字（v4、v001）
-        |                                           # 或
-        (?:\d+(?:\.\d+)+)                           # 包含至少一个小数点的数字（4.2、0.1.0）
-        (?:-(?:alpha|beta|rc|stable|latest|pre-alpha))?  # 可选的预发布标签
-        $                                           # 字符串结尾
-    """
-    core_regex = re.compile(core_pattern, re.VERBOSE | re.IGNORECASE)
-
-    return bool(core_regex.match(core_version))
+    return bool(_CORE_VERSION_PATTERN.match(core_version))
 
 
 def is_autosave(string: str) -> bool:
-    pattern = r"auto[-_\s]?save"
-    return bool(re.match(pattern, string, re.IGNORECASE))
+    return bool(_AUTOSAVE_PATTERN.match(string))
 
 
 def is_buckup(string: str) -> bool:
-    pattern = r"^bak\d*$|^backup$"
-    return bool(re.match(pattern, string, re.IGNORECASE))
+    return bool(_BUCKUP_PATTERN.match(string))
 
 
 def is_recovered(string: str) -> bool:
-    pattern = r"^recovered$"
-    return bool(re.match(pattern, string, re.IGNORECASE))
+    return bool(_RECOVERED_PATTERN.match(string))
+
+
+class IgnoreMatcher:
+    """Compiled matcher of ignore patterns (gitignore style).
+
+    All the patterns are compiled into one regex, once. Paths are relative
+    to the subspaces directory and patterns are anchored to it:
+
+    - ``content`` matches ``content`` and everything under it, not ``sub/content``.
+    - ``*`` and ``?`` match any characters, ``/`` included.
+      ``**/`` matches any leading directories, e.g. ``**/cache``.
+    - A trailing ``/`` matches directories only, e.g. ``content/``.
+    - A leading ``/`` is allowed, e.g. ``/content``.
+    - A leading ``!`` includes again the paths matched by earlier patterns,
+      e.g. ``!content/keep.txt``. Paths under an ignored directory can not be
+      included again, so ignored directories can be skipped as a whole.
+    - Empty patterns and patterns starting with ``#`` are skipped.
+
+    Usage:
+    ```python
+    matcher = IgnoreMatcher(["*.log", "Temp/", "!Temp/keep.log"])
+    assert matcher.match("Prop01/Prop01.log")
+    ```
+    """
+
+    def __init__(self, patterns: Union[str, List[str]]):
+        """Compile the ignore patterns.
+
+        Args:
+            patterns (Union[str, List[str]]): List of ignore patterns or a
+                single pattern string.
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+
+        # (regex, negated, directory only) of each pattern
+        rules: list[tuple[str, bool, bool]] = []
+        for pattern in patterns or []:
+            # Skip empty patterns and comments
+            if not pattern or pattern.strip() == "" or pattern.startswith("#"):
+                continue
+
+            negated = pattern.startswith("!")
+            pattern = pattern.removeprefix("!")
+
+            # Normalize pattern separators
+            pattern = pattern.replace("\\", "/")
+            dir_only = pattern.endswith("/")
+            pattern = pattern.strip("/")
+            if not pattern:
+                continue
+
+            rules.append((_translate(pattern), negated, dir_only))
+
+        self._negated = {f"r{i}": negated for i, (_, negated, _) in enumerate(rules)}
+
+        # The last pattern matched wins, so patterns are tried in reverse order.
+        def compile_rules(with_dir_only: bool) -> Optional[re.Pattern]:
+            alternatives = [
+                f"(?P<r{i}>{regex})"
+                for i, (regex, _, dir_only) in reversed(list(enumerate(rules)))
+                if with_dir_only or not dir_only
+            ]
+            if not alternatives:
+                return None
+            return re.compile(f"(?:{'|'.join(alternatives)})\\Z", _IGNORE_FLAGS)
+
+        self._dir_regex = compile_rules(with_dir_only=True)
+        self._file_regex = compile_rules(with_dir_only=False)
+
+    def __bool__(self) -> bool:
+        return self._dir_regex is not None
+
+    def match_entry(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """Check if a path should be ignored, assuming its parents are not.
+
+        Args:
+            path (str): Path to check.
+            is_dir (bool, optional): Whether the path is a directory, None if
+                unknown. Directory only patterns match unknown paths.
+
+        Returns:
+            bool: True if the last pattern matching the path is not negated.
+        """
+        regex = self._file_regex if is_dir is False else self._dir_regex
+        if regex is None:
+            return False
+
+        m = regex.match(_normalize_ignore_path(path))
+        return bool(m) and not self._negated[m.lastgroup]
+
+    def match(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """Check if a path should be ignored.
+
+        Args:
+            path (str): Path to check.
+            is_dir (bool, optional): Whether the path is a directory, None if
+                unknown. Directory only patterns match unknown paths.
+
+        Returns:
+            bool: True if the path or any of its parent directories is ignored.
+        """
+        if not self:
+            return False
+
+        path = _normalize_ignore_path(path)
+        parts = path.split("/")
+        for i in range(1, len(parts)):
+            if self.match_entry("/".join(parts[:i]), is_dir=True):
+                return True
+
+        return self.match_entry(path, is_dir=is_dir)
 
 
-def is_ignore(path: str, ignore: Union[str, List[str]]) -> bool:
+# Patterns are case insensitive where file names are.
+_IGNORE_FLAGS = re.DOTALL | (re.IGNORECASE if os.path.normcase("A") == "a" else 0)
+
+
+def _normalize_ignore_path(path: str) -> str:
+    # Normalize path separators to forward slashes
+    path = path.replace("\\", "/")
+    return path.strip("/")
+
+
+def _translate(pattern: str) -> str:
+    """Translate an ignore pattern to a regex, like ``fnmatch.translate``."""
+    i, n = 0, len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            if pattern.startswith("*/", i) and (i == 1 or pattern[i - 2] == "/"):
+                # "**/" matches any leading directories, or none.
+                res.append("(?:.*/)?")
+                i += 2
+                continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            res.append(".*")
+        elif c == "?":
+            res.append(".")
+        elif c == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                res.append("\\[")
+                continue
+            stuff = pattern[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if stuff.startswith("!"):
+                stuff = "^" + stuff[1:]
+            elif stuff.startswith("^"):
+                stuff = "\\" + stuff
+            res.append(f"[{stuff}]")
+        else:
+            res.append(re.escape(c))
+    return "".join(res)
+
+
+@lru_cache(maxsize=64)
+def _compile_ignore(patterns: tuple[str, ...]) -> IgnoreMatcher:
+    return IgnoreMatcher(list(patterns))
+
+
+def is_ignore(
+    path: str, ignore: Union[str, List[str]], is_dir: Optional[bool] = None
+) -> bool:
     """Check if a path should be ignored (gitignore style)
 
+    See ``IgnoreMatcher`` for the pattern syntax. The patterns are compiled
+    once and reused.
+
     Args:
         path: Path to check
         ignore: List of ignore patterns or a single pattern string
+        is_dir: Whether the path is a directory, None if unknown.
 
     Returns:
         bool: True if the path matches any ignore pattern, False otherwise
@@ -94,39 +276,4 @@ def is_ignore(path: str, ignore: Union[str, List[str]]) -> bool:
     if isinstance(ignore, str):
         ignore = [ignore]
 
-    # Normalize path separators to forward slashes
-    path = path.replace("\\", "/")
-
-    # Remove trailing slash unless it's the root directory
-    if path != "/" and path.endswith("/"):
-        path = path.rstrip("/")
-
-    # Iterate through all ignore patterns
-    for pattern in ignore:
-        # Skip empty patterns
-        if not pattern or pattern.strip() == "":
-            continue
-
-        # Normalize pattern separators
-        pattern = pattern.replace("\\", "/")
-
-        # Remove trailing slash from pattern unless it's the root directory
-        if pattern != "/" and pattern.endswith("/"):
-            pattern = pattern.rstrip("/")
-
-        # Case 1: Exact match of the entire path
-        if fnmatch.fnmatch(path, pattern):
-            return True
-
-        # Case 2: Pattern matches a directory in the path (e.g., "content" matches "content/file.txt")
-        path_parts = path.split("/")
-        for i in range(len(path_parts)):
-            partial_path = "/".join(path_parts[: i + 1])
-            if fnmatch.fnmatch(partial_path, pattern):
-                return True
-
-        # Case 3: Directory pattern (with /* suffix added)
-        if fnmatch.fnmatch(path, f"{pattern}/*"):
-            return True
-
-    return False
+    return _compile_ignore(tuple(ignore)).match(path, is_dir=is_dir)
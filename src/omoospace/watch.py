@@ -0,0 +1,446 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from enum import Enum
+from typing import Iterator, Optional, Union
+
+from omoospace.omoospace import (
+    ObjectiveTree,
+    Omoospace,
+    Subspace,
+    _cache_tree,
+    _tree_cache,
+    _tree_guard,
+    _tree_lock,
+)
+from omoospace.scanner import SubspaceScanner
+from omoospace.utils import Opath
+
+# inotify event masks, see inotify(7).
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+# Listings change on create, delete and move, not on writes to the files.
+_IN_MASK = (
+    _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding, only used to know which directories changed."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # watched directories keyed by watch descriptor, and the other way.
+        self._paths: dict[int, str] = {}
+        self._wds: dict[str, int] = {}
+
+    def watch(self, dirpaths: set[str], mask: int = _IN_MASK) -> set[str]:
+        """Watch these paths, in addition to the ones already watched.
+
+        Returns:
+            set[str]: The paths watched from now on.
+        """
+        watched = set()
+        for dirpath in dirpaths - self._wds.keys():
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), mask)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                # gone since listed, it's noticed on the next poll.
+                if errno in (2, 20):
+                    continue
+                raise OSError(errno, f"inotify_add_watch failed: {dirpath}")
+            self._paths[wd] = dirpath
+            self._wds[dirpath] = wd
+            watched.add(dirpath)
+        return watched
+
+    def wait(self, timeout: float) -> Optional[set[str]]:
+        """Wait for changes, and get the directories which have changed.
+
+        Returns:
+            Optional[set[str]]: Changed directories, empty if timed out, or
+                None if events were lost as the queue overflowed.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        overflowed = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                dirpath = self._paths.get(wd)
+                if dirpath is None:
+                    continue
+                changed.add(dirpath)
+                if mask & _IN_IGNORED:
+                    del self._paths[wd]
+                    del self._wds[dirpath]
+        return None if overflowed else changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class WatchEventType(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    RENAMED = "renamed"
+
+
+class WatchEvent:
+    """A subspace or an objective added, removed or renamed."""
+
+    def __init__(
+        self,
+        type: WatchEventType,
+        target: str,
+        src: Union[Opath, str],
+        dest: Union[Opath, str] = None,
+    ):
+        """Initialize an event.
+
+        Args:
+            type (WatchEventType): What happened.
+            target (str): "subspace" or "objective".
+            src (Union[Opath, str]): Subspace path or objective pathname.
+            dest (Union[Opath, str], optional): The new path or pathname, if
+                renamed. Defaults to None.
+        """
+        self.type = type
+        self.target = target
+        self.src = src
+        self.dest = dest
+
+    def __repr__(self):
+        dest = f" -> {self.dest}" if self.dest is not None else ""
+        return f"{self.target} {self.type.value}: {self.src}{dest}"
+
+    def __eq__(self, other):
+        if not isinstance(other, WatchEvent):
+            return NotImplemented
+        return (self.type, self.target, self.src, self.dest) == (
+            other.type,
+            other.target,
+            other.src,
+            other.dest,
+        )
+
+
+class Watcher:
+    """Keep the objective tree and the subspaces of an omoospace up to date.
+
+    The directories in the subspaces directory are watched with inotify on
+    Linux, other systems poll their modification times. Only the changed
+    directories are listed again, and the cached objective tree is patched
+    in place, so reading ``tree`` or ``subspaces`` never scans.
+
+    Usage:
+    ```python
+    with omoospace.watch() as watcher:
+        for event in watcher:
+            print(event)
+    ```
+    """
+
+    def __init__(self, omoospace: Omoospace, interval: float = 1.0):
+        """Initialize a watcher, with the tree built or taken from the cache.
+
+        Args:
+            omoospace (Omoospace): The omoospace to watch.
+            interval (float, optional): Seconds between polls, or the longest
+                wait for inotify. Defaults to 1.0.
+        """
+        self.omoospace = omoospace
+        self.interval = interval
+        self._tree = omoospace.objective_tree
+        self._subspaces = {Subspace(p) for p in self._tree._path_data}
+        self._inodes = {p: self._inode(p) for p in self._tree._path_data}
+
+        # subspace paths and objectives as of the last poll, to compare with.
+        self._known_subspaces = set(self._tree._path_data)
+        self._known_objectives = self._objectives()
+
+        try:
+            self._inotify = _Inotify() if sys.platform.startswith("linux") else None
+        except (OSError, AttributeError):
+            self._inotify = None
+        self._watch()
+
+    @property
+    def tree(self) -> ObjectiveTree:
+        """ObjectiveTree: The current objective tree, as of the last poll."""
+        return self._tree
+
+    @property
+    def subspaces(self) -> set[Subspace]:
+        """set[Subspace]: The current subspaces, as of the last poll."""
+        return self._subspaces
+
+    @staticmethod
+    def _inode(path: str) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.lstat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _watch(self) -> set[str]:
+        """Watch the listed directories, and the profile file for settings.
+
+        Returns:
+            set[str]: The listed directories watched from now on.
+        """
+        if self._inotify is None:
+            return set()
+        try:
+            watched = self._inotify.watch(set(self._tree._scanner.listings))
+            # the profile file is replaced on write, or written in place by
+            # editors, its watch is added again once replaced.
+            self._inotify.watch(
+                {str(self.omoospace.root_dir)}, _IN_MOVED_TO | _IN_CREATE | _IN_ONLYDIR
+            )
+            self._inotify.watch(
+                {str(self.omoospace.profile_file)}, _IN_CLOSE_WRITE | _IN_MOVE_SELF
+            )
+        except OSError:
+            # Out of watches, fall back to polling.
+            self._inotify.close()
+            self._inotify = None
+            return set()
+        return watched
+
+    def wait(self, timeout: float = None) -> Optional[set[str]]:
+        """Wait until something may have changed.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most. Defaults to
+                the interval.
+
+        Returns:
+            Optional[set[str]]: Directories known to have changed, or None if
+                unknown, without inotify or when its events were lost.
+        """
+        timeout = self.interval if timeout is None else timeout
+        if self._inotify is None:
+            time.sleep(timeout)
+            return None
+        return self._inotify.wait(timeout)
+
+    def poll(self, changed: set[str] = None) -> list[WatchEvent]:
+        """Update the tree and the subspaces with the changes since last poll.
+
+        Args:
+            changed (set[str], optional): Directories known to have changed,
+                as reported by `wait()`, only these are listed again. Defaults
+                to None, checking the modification time of every directory.
+
+        Returns:
+            list[WatchEvent]: Subspace events, then objective events.
+        """
+        cache_key = str(self.omoospace.profile_file)
+        with _tree_lock(cache_key):
+            # follow the cached tree, if it was built again by a reader.
+            with _tree_guard:
+                tree = _tree_cache.setdefault(cache_key, self._tree)
+            self._tree = tree
+            scanner = tree._scanner
+            listings = scanner.listings
+            if changed is not None:
+                changed = {d for d in changed if d in listings}
+            else:
+                changed = set()
+                for dirpath, (mtime, _) in listings.items():
+                    try:
+                        if os.stat(dirpath).st_mtime_ns != mtime:
+                            changed.add(dirpath)
+                    except OSError:
+                        changed.add(dirpath)
+
+            settings = SubspaceScanner.from_omoospace(self.omoospace).settings
+            rebuild = settings != scanner.settings
+            # the tree can be patched by others too, like add_subspace().
+            if not changed and not rebuild:
+                if tree._path_data.keys() == self._known_subspaces:
+                    return []
+
+            if rebuild:
+                tree = ObjectiveTree(self.omoospace)
+                _cache_tree(cache_key, tree)
+                self._tree = tree
+            else:
+                # compare the listings from top to bottom, what's under a
+                # removed directory is removed with it.
+                removed: list[str] = []
+                added: list[str] = []
+                for dirpath in sorted(changed):
+                    if dirpath not in listings:
+                        continue
+                    old_entries = set(listings.pop(dirpath)[1])
+                    new_entries = set(scanner._list_dir(dirpath))
+                    for name, _, _ in old_entries - new_entries:
+                        removed.append(os.path.join(dirpath, name))
+                    for name, _, _ in new_entries - old_entries:
+                        added.append(os.path.join(dirpath, name))
+                tree._patch(
+                    removed=[Opath(p) for p in removed], added=[Opath(p) for p in added]
+                )
+
+            subspaces = set(tree._path_data)
+            objectives = self._objectives()
+            events = self._subspace_events(self._known_subspaces, subspaces)
+            renames = {
+                e.src: e.dest for e in events if e.type == WatchEventType.RENAMED
+            }
+            events += self._objective_events(
+                self._known_objectives, objectives, renames
+            )
+            self._known_subspaces = subspaces
+            self._known_objectives = objectives
+
+        # list new directories again, for what was made in them before
+        # they were watched.
+        watched = self._watch()
+        if watched:
+            events += self.poll(watched)
+            events.sort(key=lambda e: e.target != "subspace")
+        return events
+
+    def _objectives(self) -> dict[str, frozenset[str]]:
+        """Get the subspaces of each objective, keyed by pathname."""
+        tree = self._tree
+        return {
+            pathname: frozenset(str(s) for s in tree._subspaces[id(node)])
+            for pathname, node in tree._nodes_by_pathname.items()
+        }
+
+    def _subspace_events(self, before: set[str], after: set[str]) -> list[WatchEvent]:
+        removed = before - after
+        added = after - before
+        events = []
+
+        # a path removed and a path added with the same inode is renamed.
+        added_by_inode = {}
+        for path in added:
+            self._inodes[path] = self._inode(path)
+            added_by_inode.setdefault(self._inodes[path], path)
+
+        renamed = {}
+        for path in sorted(removed):
+            inode = self._inodes.pop(path, None)
+            dest = added_by_inode.pop(inode, None) if inode else None
+            if dest is not None:
+                renamed[path] = dest
+
+        for path in sorted(removed):
+            self._subspaces.discard(Subspace(path))
+            if path in renamed:
+                dest = renamed[path]
+                event = WatchEvent(
+                    WatchEventType.RENAMED, "subspace", Opath(path), Opath(dest)
+                )
+            else:
+                event = WatchEvent(WatchEventType.REMOVED, "subspace", Opath(path))
+            events.append(event)
+
+        renamed_to = set(renamed.values())
+        for path in sorted(added):
+            self._subspaces.add(Subspace(path))
+            if path not in renamed_to:
+                events.append(WatchEvent(WatchEventType.ADDED, "subspace", Opath(path)))
+
+        return events
+
+    def _objective_events(
+        self,
+        before: dict[str, frozenset[str]],
+        after: dict[str, frozenset[str]],
+        renames: dict[Opath, Opath],
+    ) -> list[WatchEvent]:
+        renames = {str(src): str(dest) for src, dest in renames.items()}
+        removed = [p for p in before if p not in after]
+        added = [p for p in after if p not in before]
+
+        # added objectives by their subspaces and depth, to find the renamed.
+        candidates: dict[tuple[frozenset[str], int], list[str]] = {}
+        for pathname in added:
+            key = (after[pathname], pathname.count("_"))
+            candidates.setdefault(key, []).append(pathname)
+
+        events = []
+        renamed_to = set()
+        for pathname in removed:
+            # an objective is renamed if its subspaces are renamed to another.
+            subspaces = frozenset(renames.get(s, s) for s in before[pathname])
+            key = (subspaces, pathname.count("_"))
+            dests = candidates.get(key) if renames else None
+            if dests:
+                dest = dests.pop(0)
+                renamed_to.add(dest)
+                events.append(
+                    WatchEvent(WatchEventType.RENAMED, "objective", pathname, dest)
+                )
+            else:
+                events.append(WatchEvent(WatchEventType.REMOVED, "objective", pathname))
+
+        for pathname in added:
+            if pathname not in renamed_to:
+                events.append(WatchEvent(WatchEventType.ADDED, "objective", pathname))
+
+        return events
+
+    def __iter__(self) -> Iterator[WatchEvent]:
+        """Watch forever, and yield the events as they come."""
+        changed = None
+        while True:
+            yield from self.poll(changed)
+            changed = self.wait()
+
+    def close(self):
+        """Stop watching."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,58 @@
+import sys
+import pytest
+
+pytest.importorskip("typer")
+
+from typer.testing import CliRunner
+from omoospace import Omoospace, Opath
+from omoospace.commands import app
+
+
+runner = CliRunner()
+
+
+def test_commands_non_interactive(monkeypatch):
+    under = Opath("temp").resolve()
+    under.mkdir(exist_ok=True)
+    omoos_path = under / "CliProject"
+    if omoos_path.exists():
+        omoos_path.remove()
+
+    monkeypatch.chdir(under)
+    result = runner.invoke(
+        app, ["create", "CliProject", "--brief", "A cli project.", "-y"]
+    )
+    assert result.exit_code == 0, result.output
+
+    monkeypatch.chdir(omoos_path)
+    for args in [
+        ["subspace", "add", "Sc010_Shot0100", "-y"],
+        ["maker", "add", "Alice", "--email", "alice@example.com", "-y"],
+        ["tool", "add", "Blender", "--version", "5.0.0", "-y"],
+    ]:
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.output
+
+    (omoos_path / "Contents" / "Prop01.glb").touch()
+    result = runner.invoke(app, ["work", "add", "Prop01.glb", "--name", "Prop", "-y"])
+    assert result.exit_code == 0, result.output
+
+    omoospace = Omoospace(omoos_path)
+    assert omoospace.brief == "A cli project."
+    assert (omoos_path / "Subspaces" / "Sc010_Shot0100").exists()
+    assert omoospace.get_maker("Alice").email == "alice@example.com"
+    assert omoospace.get_tool("Blender").version == "5.0.0"
+    assert omoospace.get_work("Prop").version == "0.1.0"
+
+    result = runner.invoke(app, ["maker", "list"])
+    assert "alice@example.com" in result.output
+
+    # Nothing was prompted.
+    assert "InquirerPy" not in sys.modules
+
+
+def test_command_outside_omoospace(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(app, ["tree"])
+    assert result.exit_code == 1
+    assert "Error:" in result.output
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+import omoospace
+
+# Seconds a cold `import omoospace` may take, generous for slow machines.
+IMPORT_TIME_BUDGET = 0.5
+
+HEAVY_MODULES = ["pypinyin", "ruamel", "nutree", "InquirerPy", "typer"]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import omoospace
+elapsed = time.perf_counter() - start
+loaded = sorted({name.split(".")[0] for name in sys.modules})
+print(json.dumps({"elapsed": elapsed, "loaded": loaded}))
+"""
+
+
+def run_cold_import() -> dict:
+    env = dict(os.environ)
+    src_dir = os.path.dirname(os.path.dirname(omoospace.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [src_dir, env.get("PYTHONPATH")])
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", SCRIPT], env=env, text=True
+    )
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import_is_lazy():
+    result = run_cold_import()
+    for name in HEAVY_MODULES:
+        assert name not in result["loaded"]
+
+
+def test_import_time_budget():
+    # Best of a few runs, to not fail on a single hiccup.
+    elapsed = min(run_cold_import()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_TIME_BUDGET
@@ -1,10 +1,17 @@
+import asyncio
+import os
+import threading
 import pytest
 from omoospace import (
+    ObjectiveTree,
     Omoospace,
+    Subspace,
     create_omoospace,
     Opath,
     make_path,
 )
+from omoospace import omoospace as omoospace_module
+from omoospace.aio import AsyncOmoospace
 
 
 def test_create_omoospace():
@@ -97,3 +104,176 @@ def test_omoospace_other_dir():
     assert omoospace.contents_dir.is_dir()
     assert omoospace.subspaces_dir.is_dir()
     assert omoospace.profile_file.is_file()
+
+
+def test_iter_subspaces(mini_omoos_path: Opath):
+    make_path(
+        "Prop01.blend",
+        "Prop02/Prop02.blend",
+        "Temp/Prop03.blend",
+        "Temp/Cache/Prop04.blend",
+        "Contents/Models/Prop01.glb",
+        "README.md",
+        under=mini_omoos_path,
+    )
+
+    omoospace = Omoospace(mini_omoos_path)
+    omoospace.set("ignore", ["Temp"])
+
+    subspaces = list(omoospace.iter_subspaces())
+    assert all(isinstance(s, Subspace) for s in subspaces)
+    assert sorted(s.path for s in subspaces) == [
+        "Prop01.blend",
+        "Prop02",
+        "Prop02/Prop02.blend",
+    ]
+    assert omoospace.subspaces == sorted(s.path for s in subspaces)
+
+
+def test_scan_workers(mini_omoos_path: Opath):
+    make_path(
+        *[f"Sq{i}/Sq{i}_Sh{j}/Sq{i}_Sh{j}.blend" for i in range(5) for j in range(5)],
+        "Temp/Prop01.blend",
+        under=mini_omoos_path,
+    )
+
+    omoospace = Omoospace(mini_omoos_path)
+    omoospace.set("ignore", ["Temp"])
+    paths = [s.path for s in omoospace.iter_subspaces()]
+    assert len(paths) == 55
+    assert paths[:6] == ["Sq0", "Sq1", "Sq2", "Sq3", "Sq4", "Sq0/Sq0_Sh0"]
+
+    # the same subspaces in the same order, listed in parallel.
+    omoospace.set("scan_workers", 4)
+    assert [s.path for s in omoospace.iter_subspaces()] == paths
+
+
+def test_path_checks(mini_omoos_path: Opath, tmp_path, monkeypatch):
+    root = mini_omoos_path
+    make_path("Prop01.blend", "Contents/Models/Prop01.glb", under=root)
+    make_path("Outside.blend", under=tmp_path)
+    omoospace = Omoospace(root)
+
+    assert omoospace.is_subspace(root / "Prop01.blend")
+    assert omoospace.is_subspace(root / "Contents" / ".." / "Prop01.blend")
+    assert not omoospace.is_subspace(root / "Contents" / "Models" / "Prop01.glb")
+    assert omoospace.is_content(root / "Contents" / "Models" / "Prop01.glb")
+    assert omoospace.is_item(root / "Prop01.blend")
+    assert not omoospace.is_item(root / "Omoospace.yml")
+
+    # symbolic links are only followed if asked.
+    link = root / "Outside.blend"
+    link.symlink_to(tmp_path / "Outside.blend")
+    assert omoospace.is_subspace(link)
+    assert not omoospace.is_subspace(link, follow_symlinks=True)
+    assert link.is_under(root)
+    assert not link.is_under(root, follow_symlinks=True)
+    assert root.is_under(root, or_equal=True)
+    assert not Opath(str(root) + "Other").is_under(root)
+
+    # paths given through a symbolic link to the root are in it.
+    root_link = Opath(tmp_path, "RootLink")
+    root_link.symlink_to(root, target_is_directory=True)
+    assert omoospace.is_subspace(root_link / "Prop01.blend")
+    assert not omoospace.is_subspace(root_link / "Omoospace.yml")
+    assert omoospace.is_content(root_link / "Contents" / "Models" / "Prop01.glb")
+    assert omoospace.is_item(root_link / "Prop01.blend")
+    assert (root_link / "Prop01.blend").is_under(root)
+    assert (root / "Prop01.blend").is_under(root_link)
+    assert not omoospace.is_item(tmp_path / "Outside.blend")
+
+    # names keep their case where the system ignores it, as on Windows.
+    monkeypatch.setattr(os.path, "normcase", str.lower)
+    assert omoospace.is_subspace(root / "Prop01.blend")
+    assert not omoospace.is_subspace(root / "README.md", require_exists=False)
+    assert not omoospace.is_subspace(root / "Omoospace.yml")
+    assert not omoospace.is_item(root / "Omoospace.yml")
+    assert Opath(str(root).upper()).is_under(root, or_equal=True)
+    assert root / "Prop01.blend" in (root / "Contents" / "..").get_children()
+
+
+def test_detect_omoospace(mini_omoos_path: Opath, monkeypatch):
+    prop = make_path("Props/Prop01/Prop01.blend", under=mini_omoos_path)
+    assert Omoospace(prop).root_dir == mini_omoos_path
+
+    globs = []
+    glob = Opath.glob
+    monkeypatch.setattr(Opath, "glob", lambda s, p: globs.append(s) or glob(s, p))
+
+    # unchanged directories are not searched again.
+    assert Omoospace(prop).root_dir == mini_omoos_path
+    assert Omoospace(prop.parent).root_dir == mini_omoos_path
+    assert len(globs) == 0
+
+    # a new profile file in a cached directory is found.
+    make_path("Props/Omoospace.yml", under=mini_omoos_path)
+    assert Omoospace(prop).root_dir == Opath(mini_omoos_path, "Props")
+    assert len(globs) == 1
+
+    # the least recently used directories are dropped.
+    monkeypatch.setattr(omoospace_module, "ROOT_CACHE_SIZE", 2)
+    other = make_path("Others/Other.blend", under=mini_omoos_path)
+    assert Omoospace(other).root_dir == mini_omoos_path
+    assert list(omoospace_module._root_cache) == [
+        str(other.parent),
+        str(mini_omoos_path),
+    ]
+
+
+def test_tree_locks(mini_omoos_path: Opath, empty_omoos_path: Opath):
+    mini = Omoospace(mini_omoos_path)
+    empty = Omoospace(empty_omoos_path)
+
+    # a tree being built doesn't hold up the tree of another omoospace.
+    with omoospace_module._tree_lock(str(mini.profile_file)):
+        reader = threading.Thread(target=lambda: empty.objective_tree)
+        reader.start()
+        reader.join(5)
+        assert not reader.is_alive()
+    assert mini.objective_tree is not empty.objective_tree
+
+
+def test_async_omoospace(mini_omoos_path: Opath):
+    make_path(
+        *[f"Prop{i:02}.blend" for i in range(10)],
+        "Heart.blend",
+        "Heart_Valves.spp",
+        under=mini_omoos_path,
+    )
+
+    async def main():
+        omoospace = await AsyncOmoospace.open(mini_omoos_path)
+        await omoospace.set("brief", "An async omoospace.")
+        assert await omoospace.get("brief") == "An async omoospace."
+
+        streamed = [s async for s in omoospace.iter_subspaces(batch_size=3)]
+        assert set(streamed) == set(await omoospace.subspaces())
+        assert len(streamed) == 12
+
+        # stopping early stops the walk.
+        async for subspace in omoospace.iter_subspaces(batch_size=1):
+            break
+
+        trees = await asyncio.gather(*[omoospace.objective_tree() for _ in range(4)])
+        assert all(tree.count == trees[0].count for tree in trees)
+
+        heart = await omoospace.add_subspace("heart")
+        assert (heart / "Heart_Valves.spp").exists()
+        objective = await omoospace.extract_objective(heart / "Heart_Valves.spp")
+        assert objective.pathname == "Heart_Valves"
+        assert "Valves" in await omoospace.objective_tree()
+
+        # writes and tree patches run concurrently.
+        await asyncio.gather(
+            omoospace.set("brief", "A concurrent omoospace."),
+            *[omoospace.add_subspace(f"Prop{i:02}") for i in range(5)],
+            *[omoospace.extract_objective(heart) for _ in range(5)],
+            omoospace.set("notes", {"Client": "Nobody"}),
+        )
+        assert await omoospace.get("brief") == "A concurrent omoospace."
+        assert await omoospace.get("notes") == {"Client": "Nobody"}
+        tree = await omoospace.objective_tree()
+        assert all(f"Prop{i:02}" in tree for i in range(5))
+        assert tree.count == ObjectiveTree(omoospace.omoospace).count
+
+    asyncio.run(main())
@@ -1,5 +1,9 @@
+import json
+from datetime import date, datetime
+import multiprocessing
+import threading
 import pytest
-from omoospace import make_path, Opath, Omoospace
+from omoospace import make_path, Opath, Omoospace, common
 from shutil import copy
 
 
@@ -197,3 +201,370 @@ def test_zh_profile():
     assert work.version == None
     assert work.contents == ["Models/道具02/道具02.fbx", "Models/道具02/Textures"]
     assert len(work.contributions) == 0
+
+
+def test_profile_cache(mini_omoos_path: Opath, monkeypatch):
+    omoospace = Omoospace(mini_omoos_path)
+    omoospace.add_maker({"name": "Alice", "email": "alice@example.com"})
+
+    loads = []
+    yaml = common.get_safe_yaml()
+    load = yaml.load
+    monkeypatch.setattr(yaml, "load", lambda f: loads.append(f) or load(f))
+
+    # reads reuse the snapshot which was kept on write.
+    for _ in range(10):
+        assert omoospace.brief == "A mini omoospace."
+        assert omoospace.get_maker("Alice").email == "alice@example.com"
+    assert len(loads) == 0
+
+    # returned data is a copy, changing it won't touch the snapshot.
+    omoospace.get("makers")["Alice"] = None
+    assert omoospace.get_maker("Alice").email == "alice@example.com"
+
+    # values given to set() can be changed after, without touching the snapshot.
+    makers = omoospace.get("makers")
+    omoospace.set("makers", makers)
+    makers["Mallory"] = {}
+    assert "Mallory" not in omoospace.makers
+
+    # changes from outside are picked up.
+    with omoospace.profile_file.open("w", encoding="utf-8") as file:
+        file.write("brief: Changed outside.\n")
+    assert omoospace.brief == "Changed outside."
+    assert len(loads) == 1
+
+
+def test_profile_batch(mini_omoos_path: Opath, monkeypatch):
+    omoospace = Omoospace(mini_omoos_path)
+
+    writes = []
+    write = Omoospace._write_profile
+    monkeypatch.setattr(
+        Omoospace, "_write_profile", lambda s, d: writes.append(d) or write(s, d)
+    )
+
+    # a work with all fields is written at once.
+    omoospace.add_work(
+        {
+            "name": "Short01",
+            "brief": "A short.",
+            "version": "0.1.0",
+            "contributions": {"Director": ["Alice", "Bob"]},
+        }
+    )
+    assert len(writes) == 1
+
+    with omoospace.batch():
+        omoospace.brief = "A batched omoospace."
+        omoospace.add_tool({"name": "Blender", "version": "4.2.0"})
+        assert omoospace.brief == "A batched omoospace."
+        assert omoospace.get_tool("Blender").version == "4.2.0"
+        assert len(writes) == 1
+    assert len(writes) == 2
+    assert omoospace.brief == "A batched omoospace."
+
+    # changes are discarded on exception.
+    with pytest.raises(ValueError):
+        with omoospace.batch():
+            omoospace.brief = "Discarded."
+            omoospace.add_maker({"name": "Carol", "email": "not an email"})
+    assert len(writes) == 2
+    assert omoospace.brief == "A batched omoospace."
+    assert "Carol" not in omoospace.makers
+
+    # existing items are not written again.
+    omoospace.add_maker("Alice")
+    assert len(writes) == 2
+
+
+def test_profile_keeps_comments(mini_omoos_path: Opath):
+    omoospace = Omoospace(mini_omoos_path)
+    with omoospace.profile_file.open("w", encoding="utf-8") as file:
+        file.write(
+            "# The project profile.\n"
+            "brief: A mini omoospace. # short\n"
+            "tools:\n"
+            "  # The one we use.\n"
+            "  Houdini: 20.0\n"
+        )
+
+    omoospace.brief = "A commented omoospace."
+    omoospace.add_maker({"name": "Alice", "email": "alice@example.com"})
+
+    text = omoospace.profile_file.read_text(encoding="utf-8")
+    assert "# The project profile." in text
+    assert "brief: A commented omoospace. # short" in text
+    assert "# The one we use." in text
+    assert "Houdini: 20.0" in text
+    assert omoospace.get_maker("Alice").email == "alice@example.com"
+
+
+def add_makers(omoos_path: str, prefix: str, count: int):
+    omoospace = Omoospace(omoos_path)
+    for i in range(count):
+        omoospace.add_maker({"name": f"{prefix}{i}", "email": f"{prefix}{i}@a.com"})
+
+
+def test_profile_concurrent_writes(mini_omoos_path: Opath):
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=add_makers, args=(str(mini_omoos_path), p, 10))
+        for p in ["alice", "bob", "carol", "dave"]
+    ]
+    for process in processes:
+        process.start()
+    # writes from this process are not lost either.
+    omoospace = Omoospace(mini_omoos_path)
+    add_makers(str(mini_omoos_path), "eve", 10)
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    makers = omoospace.makers
+    assert len(makers) == 50
+    assert omoospace.get_maker("dave9").email == "dave9@a.com"
+    assert omoospace.brief == "A mini omoospace."
+    assert not list(mini_omoos_path.glob("*.tmp"))
+
+
+def test_profile_shards(mini_omoos_path: Opath, monkeypatch):
+    omoospace = Omoospace(mini_omoos_path)
+    omoospace.add_maker({"name": "Alice", "email": "alice@example.com"})
+    omoospace.add_tool({"name": "Blender", "version": "4.2.0"})
+
+    # without shards, reads don't look for shard files.
+    reads = []
+    read_file = common._read_file
+    monkeypatch.setattr(common, "_read_file", lambda p: reads.append(p) or read_file(p))
+    assert omoospace.get_maker("Alice").email == "alice@example.com"
+    assert reads and all(p == omoospace.profile_file for p in reads)
+    monkeypatch.undo()
+
+    omoospace.split_profile()
+    shards_dir = mini_omoos_path / "Omoospace.d"
+    assert (shards_dir / "makers.yml").is_file()
+    assert (shards_dir / "works.yml").is_file()
+    assert "makers" not in omoospace.profile_file.read_text(encoding="utf-8")
+    assert omoospace.get_maker("Alice").email == "alice@example.com"
+
+    # only the changed shard is written.
+    profile_mtime = omoospace.profile_file.stat().st_mtime_ns
+    tools_mtime = (shards_dir / "tools.yml").stat().st_mtime_ns
+    omoospace.get_maker("Alice").website = "https://alice.example.com"
+    omoospace.add_work({"name": "Short01", "version": "0.1.0"})
+    assert omoospace.profile_file.stat().st_mtime_ns == profile_mtime
+    assert (shards_dir / "tools.yml").stat().st_mtime_ns == tools_mtime
+    assert "Short01" in (shards_dir / "works.yml").read_text(encoding="utf-8")
+
+    # shards are not subspaces.
+    assert not omoospace.is_subspace(shards_dir / "works.yml")
+    assert not any("works" in str(s) for s in omoospace.subspaces)
+
+    omoospace.merge_profile()
+    assert not shards_dir.exists()
+    omoospace = Omoospace(mini_omoos_path)
+    assert omoospace.get_maker("Alice").website == "https://alice.example.com"
+    assert omoospace.get_work("Short01").version == "0.1.0"
+    assert omoospace.get_tool("Blender").version == "4.2.0"
+    assert omoospace.brief == "A mini omoospace."
+
+
+def test_profile_journal(mini_omoos_path: Opath, monkeypatch):
+    omoospace = Omoospace(mini_omoos_path)
+    omoospace.add_tool({"name": "Blender", "version": "4.2.0"})
+
+    # without a journal, reads don't look for it.
+    reads = []
+    read_journal = common._read_journal
+    monkeypatch.setattr(
+        common, "_read_journal", lambda p: reads.append(p) or read_journal(p)
+    )
+    assert omoospace.get_tool("Blender").version == "4.2.0"
+    assert not reads
+
+    omoospace.create_journal()
+    profile_text = omoospace.profile_file.read_text(encoding="utf-8")
+
+    # changes are appended to the journal, one record per field.
+    omoospace.get_tool("Blender").version = "4.3.0"
+    omoospace.brief = "A journaled omoospace."
+    assert reads
+    assert omoospace.profile_file.read_text(encoding="utf-8") == profile_text
+    records = list(omoospace.history())
+    assert [r["path"] for r in records] == [
+        ["tools", "Blender", "version"],
+        ["brief"],
+    ]
+    assert records[0]["value"] == "4.3.0"
+
+    # readers apply the journal, also when read from scratch.
+    common._profile_cache.clear()
+    common._journal_cache.clear()
+    omoospace = Omoospace(mini_omoos_path)
+    assert omoospace.get_tool("Blender").version == "4.3.0"
+    assert omoospace.brief == "A journaled omoospace."
+
+    omoospace.get_tool("Blender").remove()
+    assert "Blender" not in omoospace.tools
+
+    omoospace.compact()
+    assert omoospace.journal_file.read_text(encoding="utf-8") == ""
+    assert "A journaled omoospace." in omoospace.profile_file.read_text(
+        encoding="utf-8"
+    )
+    assert "Blender" not in omoospace.tools
+    assert len(list(omoospace.history())) == 3
+
+    # compacted once grown too large.
+    monkeypatch.setattr(common, "JOURNAL_MAX_SIZE", 200)
+    for i in range(5):
+        omoospace.add_maker({"name": f"Maker{i}", "email": f"maker{i}@a.com"})
+    assert omoospace.journal_file.stat().st_size < 400
+    assert "Maker0" in omoospace.profile_file.read_text(encoding="utf-8")
+    assert len(omoospace.makers) == 5
+
+    omoospace.remove_journal()
+    assert not omoospace.journal_file.exists()
+    assert omoospace.get_maker("Maker4").email == "maker4@a.com"
+
+
+def test_profile_journal_types(mini_omoos_path: Opath):
+    omoospace = Omoospace(mini_omoos_path)
+    omoospace.create_journal()
+    notes = {
+        "due": date(2026, 3, 4),
+        "at": datetime(2026, 3, 4, 12, 30),
+        "tags": {"wip"},
+        "shots": {10: "Sh010"},
+        "tag": {"!date": "not a date"},
+    }
+    omoospace.set("notes", notes)
+    assert list(omoospace.history())[-1]["value"] == notes
+
+    # read back with the same types, also once compacted.
+    common._journal_cache.clear()
+    assert omoospace.get("notes") == notes
+    omoospace.compact()
+    common._profile_cache.clear()
+    assert omoospace.get("notes") == notes
+
+    with pytest.raises(TypeError):
+        omoospace.set("notes", {"path": Opath("Notes.md")})
+    assert omoospace.get("notes") == notes
+
+
+def test_profile_journal_compacted(mini_omoos_path: Opath):
+    writer = Omoospace(mini_omoos_path)
+    writer.create_journal()
+    writer.brief = "Written before compacting."
+    writer.add_tool({"name": "Blender", "version": "4.2.0"})
+
+    reader = Omoospace(mini_omoos_path)
+    assert reader.brief == "Written before compacting."
+
+    writer.compact()
+    assert reader.brief == "Written before compacting."
+    assert reader.get_tool("Blender").version == "4.2.0"
+    writer.brief = "Written after compacting."
+    assert reader.brief == "Written after compacting."
+
+    # compacted in place by another process, with fewer bytes than read.
+    writer._write_files({"brief": "Written after compacting."})
+    record = {"time": 0, "user": "mallory", "path": ["brief"], "value": "New."}
+    writer.journal_file.write_text(json.dumps(record) + "\n", encoding="utf-8")
+    assert reader.brief == "New."
+    assert reader.get_tool("Blender").version == "4.2.0"
+
+
+def test_profile_bulk(mini_omoos_path: Opath, monkeypatch):
+    omoospace = Omoospace(mini_omoos_path)
+    (mini_omoos_path / "Contents" / "Prop01.glb").touch()
+
+    writes = []
+    write = Omoospace._write_profile
+    monkeypatch.setattr(
+        Omoospace, "_write_profile", lambda s, d: writes.append(d) or write(s, d)
+    )
+
+    makers = omoospace.add_makers(
+        {"name": f"Maker{i:03}", "email": f"maker{i:03}@example.com"}
+        for i in range(300)
+    )
+    tools = omoospace.add_tools(
+        [{"name": "Blender", "version": "4.2.0"}, {"name": "Houdini"}, "Nuke"]
+    )
+    works = omoospace.add_works(
+        [
+            {"name": "Short01", "version": "0.1.0", "contributions": ["Maker001"]},
+            "Prop01.glb",
+        ]
+    )
+    assert len(writes) == 3
+    assert len(makers) == 300 and len(omoospace.makers) == 300
+    assert omoospace.get_maker("Maker299").email == "maker299@example.com"
+    assert [t.name for t in tools] == ["Blender", "Houdini", "Nuke"]
+    assert omoospace.get_tool("Blender").version == "4.2.0"
+    assert omoospace.get_work("Prop01").contents == ["Prop01.glb"]
+    assert works[0].contributions == {"Maker": {"Maker001"}}
+
+    # everything is validated before anything is written.
+    with pytest.raises(ValueError):
+        omoospace.add_makers(["Alice", {"name": "Bob", "email": "not an email"}])
+    with pytest.raises(ValueError):
+        omoospace.add_tools([{"name": "Maya", "version": "4.x"}])
+    with pytest.raises(ValueError):
+        omoospace.add_works(
+            [{"name": "Short02", "contributions": [{"name": "Bob", "email": "bad"}]}]
+        )
+    assert len(writes) == 3
+    assert "Alice" not in omoospace.makers
+
+    omoospace.remove_makers([f"Maker{i:03}" for i in range(100)] + ["Nobody"])
+    omoospace.remove_tools(tools[:2])
+    omoospace.remove_works(["Short01", "Prop01"])
+    assert len(writes) == 6
+    assert len(omoospace.makers) == 200
+    assert omoospace.tools == {"Nuke"}
+    assert len(omoospace.works) == 0
+
+
+def test_profile_batch_threads(mini_omoos_path: Opath):
+    omoospace = Omoospace(mini_omoos_path)
+    batched = threading.Event()
+    checked = threading.Event()
+    seen = []
+
+    def batch_and_raise():
+        with pytest.raises(RuntimeError):
+            with omoospace.batch():
+                omoospace.brief = "Uncommitted."
+                batched.set()
+                checked.wait(5)
+                raise RuntimeError()
+
+    def read_and_set():
+        batched.wait(5)
+        # the other thread's batch is neither seen nor joined.
+        seen.append(omoospace.brief)
+        checked.set()
+        omoospace.add_maker({"name": "Alice", "email": "alice@example.com"})
+
+    threads = [
+        threading.Thread(target=batch_and_raise),
+        threading.Thread(target=read_and_set),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert seen == ["A mini omoospace."]
+    assert omoospace.brief == "A mini omoospace."
+    assert omoospace.get_maker("Alice").email == "alice@example.com"
+
+
+def test_profile_yaml_export():
+    from omoospace.common import yaml
+
+    assert yaml is common.get_yaml()
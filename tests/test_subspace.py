@@ -1,7 +1,17 @@
+import os
+import struct
 import pytest
 from pathlib import Path
-from omoospace import ObjectiveType, extract_pathname, Omoospace, make_path, Opath
+from omoospace import (
+    ObjectiveTree,
+    ObjectiveType,
+    extract_pathname,
+    Omoospace,
+    make_path,
+    Opath,
+)
 from omoospace.omoospace import Subspace
+from omoospace.watch import WatchEvent, WatchEventType
 from tests.helper import factory_make_item
 
 subspace = factory_make_item("Subspaces")
@@ -117,3 +127,253 @@ def test_objective_node(empty_omoos_path: Path):
     assert o_Shot0100 != None
     assert o_Shot0100.type == ObjectiveType.DIRECTORY
     assert len(o_Shot0100.subspaces) == 1
+
+
+def test_extract_path_data_many(empty_omoos_path: Path):
+    paths = make_path(
+        "Sc010/Sc010.blend",
+        "Sc010/Shot0100/Shot0100.blend",
+        "Sc010/Shot0100/Sc010_Shot0100_Prop01.blend",
+        "Sc010/Shot0200_Prop01.blend",
+        under=Path(empty_omoos_path, "Subspaces"),
+    )
+
+    path_data_list = Omoospace.extract_path_data_many(paths)
+    assert len(path_data_list) == len(paths)
+    for path, path_data in zip(paths, path_data_list):
+        expected = Omoospace.extract_path_data(path)
+        assert [d.name for d in path_data] == [d.name for d in expected]
+        assert [d.subspaces for d in path_data] == [d.subspaces for d in expected]
+
+    assert [d.name for d in path_data_list[0]] == ["Sc010"]
+    assert len(path_data_list[0][0].subspaces) == 2
+    assert [d.name for d in path_data_list[2]] == ["Sc010", "Shot0100", "Prop01"]
+
+    with pytest.raises(ValueError):
+        Omoospace.extract_path_data_many([*paths, empty_omoos_path / "Contents"])
+
+
+def test_objective_tree_lookup(empty_omoos_path: Path):
+    make_path(
+        "Sc010_Shot0100/Prop01.blend",
+        "Sc010_Shot0200/Prop01.blend",
+        "Sc020/Shot0100.blend",
+        under=Path(empty_omoos_path, "Subspaces"),
+    )
+
+    o_tree = Omoospace(empty_omoos_path).objective_tree
+    assert "Prop01" in o_tree
+    assert "Prop02" not in o_tree
+
+    assert o_tree.get("Shot0100").pathname in ["Sc010_Shot0100", "Sc020_Shot0100"]
+    assert o_tree.get("Sc020_Shot0100").pathname == "Sc020_Shot0100"
+    assert o_tree.get("Sc010_Shot0200_Prop01").parent.name == "Shot0200"
+    assert o_tree.get("Sc030_Shot0100") is None
+
+    o_Sc010 = o_tree.get("Sc010")
+    assert "Prop01" in o_Sc010
+    assert "Sc010" not in o_Sc010
+    assert "Prop01" not in o_tree.get("Sc020")
+    assert "Prop01" in o_Sc010.children[0]
+
+
+def test_objective_tree_cache(empty_omoos_path: Path):
+    make_path(
+        "Heart.blend",
+        "Heart_Valves.spp",
+        "Liver/Liver.zpr",
+        under=Path(empty_omoos_path, "Subspaces"),
+    )
+
+    omoospace = Omoospace(empty_omoos_path)
+    o_tree = omoospace.objective_tree
+    assert Omoospace(empty_omoos_path).objective_tree is o_tree
+
+    # the cached tree is patched in place.
+    omoospace.add_subspace("heart")
+    assert omoospace.objective_tree is o_tree
+    o_Heart = o_tree.get("Heart")
+    assert o_Heart.type == ObjectiveType.DIRECTORY
+    assert {s.path for s in o_Heart.subspaces} == {"Heart", "Heart/Heart.blend"}
+    assert o_tree.get("Heart_Valves").subspaces == ["Heart/Heart_Valves.spp"]
+
+    rebuilt = ObjectiveTree(omoospace)
+    assert {o.pathname for o in o_tree} == {o.pathname for o in rebuilt}
+    for o in rebuilt:
+        assert o_tree.get(o.pathname).subspaces == o.subspaces
+
+    # the tree is built again when the subspaces directory has changed.
+    make_path("Kidney.blend", under=omoospace.subspaces_dir)
+    assert omoospace.objective_tree is not o_tree
+    assert "Kidney" in omoospace.objective_tree
+
+    # deeper changes are checked every TREE_CHECK_INTERVAL, or on refresh.
+    o_tree = omoospace.objective_tree
+    make_path("Liver/Liver_Lobe.zpr", under=omoospace.subspaces_dir)
+    assert omoospace.objective_tree is o_tree
+    assert omoospace.refresh_objective_tree() is not o_tree
+    assert "Lobe" in omoospace.objective_tree
+
+    # a new subspace has its objective straight away.
+    o_tree = omoospace.objective_tree
+    lobe = make_path("Liver/Liver_Lobe_Left.zpr", under=omoospace.subspaces_dir)
+    assert omoospace.objective_tree is o_tree
+    assert Subspace(lobe).objective.pathname == "Liver_Lobe_Left"
+
+    # or the settings in the profile.
+    o_tree = omoospace.objective_tree
+    omoospace.set("ignore", ["Liver"])
+    assert omoospace.objective_tree is not o_tree
+    assert "Liver" not in omoospace.objective_tree
+
+    # a profile in another language has its own settings, and tree.
+    zh_omoospace = Omoospace(empty_omoos_path, language="zh")
+    zh_omoospace.set("ignore", ["Heart"])
+    assert "Liver" in zh_omoospace.objective_tree
+    assert "Heart" not in zh_omoospace.objective_tree
+    assert "Liver" not in omoospace.objective_tree
+
+
+def test_subspace_index(empty_omoos_path: Path, monkeypatch):
+    make_path(
+        "Heart/Heart.blend",
+        "Heart/Heart_Valves.spp",
+        "Liver/Liver.zpr",
+        under=Path(empty_omoos_path, "Subspaces"),
+    )
+    omoospace = Omoospace(empty_omoos_path)
+    expected = {o.pathname: o.subspaces for o in ObjectiveTree(omoospace)}
+
+    omoospace.create_index()
+    assert (empty_omoos_path / ".omoospace" / "index").is_file()
+
+    def scandir(path):
+        if str(path).startswith(str(omoospace.subspaces_dir)):
+            listed.append(str(path))
+        return os_scandir(path)
+
+    listed = []
+    os_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    # nothing is listed again while the directories are unchanged.
+    o_tree = ObjectiveTree(omoospace)
+    assert {o.pathname: o.subspaces for o in o_tree} == expected
+    assert set(omoospace.subspaces) == set(Omoospace(empty_omoos_path).subspaces)
+    assert listed == []
+
+    # only the changed directory is listed again.
+    make_path("Liver/Liver_Lobe.zpr", under=omoospace.subspaces_dir)
+    o_tree = ObjectiveTree(omoospace)
+    assert listed == [str(omoospace.subspaces_dir / "Liver")]
+    assert o_tree.get("Liver_Lobe").subspaces == ["Liver/Liver_Lobe.zpr"]
+    assert "Liver/Liver_Lobe.zpr" in {s.path for s in omoospace.subspaces}
+
+    # the index is not a subspace.
+    omoospace.subspaces_dir = "."
+    assert ".omoospace" not in {s.path for s in omoospace.subspaces}
+    assert not omoospace.is_subspace(empty_omoos_path / ".omoospace")
+
+    omoospace.remove_index()
+    assert not (empty_omoos_path / ".omoospace" / "index").exists()
+
+
+def test_watch(empty_omoos_path: Path):
+    make_path(
+        "Heart/Heart.blend",
+        "Liver.zpr",
+        under=Path(empty_omoos_path, "Subspaces"),
+    )
+    omoospace = Omoospace(empty_omoos_path)
+    subspaces_dir = omoospace.subspaces_dir
+
+    with omoospace.watch(interval=0.1) as watcher:
+        assert watcher.tree is omoospace.objective_tree
+        assert watcher.poll() == []
+
+        make_path("Heart/Heart_Valves.spp", under=subspaces_dir)
+        valves = subspaces_dir / "Heart/Heart_Valves.spp"
+        assert watcher.poll() == [
+            WatchEvent(WatchEventType.ADDED, "subspace", valves),
+            WatchEvent(WatchEventType.ADDED, "objective", "Heart_Valves"),
+        ]
+
+        Path(subspaces_dir, "Liver.zpr").rename(subspaces_dir / "Lung.zpr")
+        assert watcher.poll() == [
+            WatchEvent(
+                WatchEventType.RENAMED,
+                "subspace",
+                subspaces_dir / "Liver.zpr",
+                subspaces_dir / "Lung.zpr",
+            ),
+            WatchEvent(WatchEventType.RENAMED, "objective", "Liver", "Lung"),
+        ]
+
+        Opath(subspaces_dir, "Heart").remove()
+        events = watcher.poll()
+        assert {(e.type, e.src) for e in events if e.target == "objective"} == {
+            (WatchEventType.REMOVED, "Heart"),
+            (WatchEventType.REMOVED, "Heart_Valves"),
+        }
+
+        rebuilt = ObjectiveTree(omoospace)
+        assert {o.pathname for o in watcher.tree} == {o.pathname for o in rebuilt}
+        assert watcher.subspaces == {Subspace(subspaces_dir / "Lung.zpr")}
+        assert omoospace.objective_tree is watcher.tree
+
+
+def test_watch_inotify(empty_omoos_path: Path):
+    make_path("Heart/Heart.blend", under=Path(empty_omoos_path, "Subspaces"))
+    omoospace = Omoospace(empty_omoos_path)
+    subspaces_dir = omoospace.subspaces_dir
+
+    with omoospace.watch(interval=0.1) as watcher:
+        if watcher._inotify is None:
+            pytest.skip("inotify is not available")
+
+        # writing to a file does not change any listing.
+        Path(subspaces_dir, "Heart/Heart.blend").write_text("beat")
+        assert watcher.wait() == set()
+
+        make_path("Lung.zpr", under=subspaces_dir)
+        changed = watcher.wait()
+        assert changed == {str(subspaces_dir)}
+        assert watcher.poll(changed) == [
+            WatchEvent(WatchEventType.ADDED, "subspace", subspaces_dir / "Lung.zpr"),
+            WatchEvent(WatchEventType.ADDED, "objective", "Lung"),
+        ]
+
+        # only the reported directories are listed again.
+        make_path("Heart/Heart_Valves.spp", under=subspaces_dir)
+        valves = subspaces_dir / "Heart/Heart_Valves.spp"
+        assert watcher.poll(set()) == []
+        assert watcher.poll(watcher.wait()) == [
+            WatchEvent(WatchEventType.ADDED, "subspace", valves),
+            WatchEvent(WatchEventType.ADDED, "objective", "Heart_Valves"),
+        ]
+
+        # made in a new directory before it's watched.
+        inotify_watch = watcher._inotify.watch
+
+        def watch(paths, *args):
+            if str(subspaces_dir / "Kidney") in paths:
+                make_path("Kidney/Kidney.blend", under=subspaces_dir)
+            return inotify_watch(paths, *args)
+
+        watcher._inotify.watch = watch
+        make_path("Kidney/", under=subspaces_dir)
+        kidney = subspaces_dir / "Kidney/Kidney.blend"
+        assert watcher.poll(watcher.wait()) == [
+            WatchEvent(WatchEventType.ADDED, "subspace", subspaces_dir / "Kidney"),
+            WatchEvent(WatchEventType.ADDED, "subspace", kidney),
+            WatchEvent(WatchEventType.ADDED, "objective", "Kidney"),
+        ]
+
+        # events lost as the queue overflowed, every directory is checked.
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.write(write_fd, struct.pack("iIII", -1, 0x4000, 0, 0))
+        os.close(watcher._inotify.fd)
+        watcher._inotify.fd = read_fd
+        assert watcher.wait() is None
+        os.close(write_fd)
@@ -1,6 +1,9 @@
+import copy
+import os
 import pytest
 from omoospace import (
     normalize_name,
+    normalize_names,
     copy_to_clipboard,
     Maker,
     Work,
@@ -69,6 +72,41 @@ def test_opath(mini_omoos_path: Opath):
     assert (root / "Temp" / "Prop03" / "PartC.blend").exists()
 
 
+def test_iter_children(mini_omoos_path: Opath):
+    root = mini_omoos_path
+    make_path(
+        "Prop01.blend",
+        "Prop02/Prop02.blend",
+        "Prop02/Textures/Prop02_Color.png",
+        "Temp/Prop03.blend",
+        under=root,
+    )
+
+    children = root.iter_children()
+    assert next(children) in root.get_children()
+    assert {c.resolve() for c in root.iter_children()} == set(root.get_children())
+
+    # only the direct children.
+    assert {c.name for c in root.iter_children(max_depth=1)} == {
+        "Contents",
+        "Omoospace.yml",
+        "Prop01.blend",
+        "Prop02",
+        "Temp",
+    }
+    assert {c.name for c in root.iter_children(max_depth=2)} >= {"Prop02.blend"}
+    assert "Prop02_Color.png" not in {c.name for c in root.iter_children(max_depth=2)}
+
+    # pruned directories are skipped with everything under them.
+    entries = root.iter_children(prune=lambda e: e.name == "Temp", entries=True)
+    names = set()
+    for entry in entries:
+        assert isinstance(entry, os.DirEntry)
+        names.add(entry.name)
+    assert "Temp" not in names and "Prop03.blend" not in names
+    assert "Prop02_Color.png" in names
+
+
 def test_oset(mini_omoos_path: Opath):
     omoospace = Omoospace(mini_omoos_path)
 
@@ -118,9 +156,49 @@ def test_normalize_name(name: str, expected: str):
     assert normalize_name(name) == expected
 
 
+def test_normalize_names():
+    names = ["Sc010_Shot0100.v001", "Prop01 v001", "Sc010_Shot0100.v002"]
+    assert normalize_names(names) == ["Sc010_Shot0100", "Prop01", "Sc010_Shot0100"]
+    assert normalize_names([]) == []
+
+    with pytest.raises(ValueError):
+        normalize_names(["Prop01", "v001"])
+
+
 def test_copy_to_clipboard():
     try:
         copy_to_clipboard("The text to be copied to the clipboard.")
         assert pyperclip.paste() == "The text to be copied to the clipboard."
     except:
         pass
+
+
+def test_oset_index(mini_omoos_path: Opath):
+    omoospace = Omoospace(mini_omoos_path)
+    makers = Oset[Maker]([Maker(omoospace, "Alice"), Maker(omoospace, "Bob")])
+
+    alice = makers.get("Alice")
+    assert alice.name == "Alice"
+    assert makers.get(Maker(omoospace, "Alice")) is alice
+    assert makers.get("Charlie") is None
+    assert makers.get(123) is None
+
+    makers.remove("Alice")
+    assert "Alice" not in makers
+    assert len(makers) == 1
+    with pytest.raises(KeyError):
+        makers.remove("Alice")
+
+    makers |= [Maker(omoospace, "Charlie"), Maker(omoospace, "Bob")]
+    assert makers == {"Bob", "Charlie"}
+    makers -= ["Bob"]
+    assert makers == {"Charlie"}
+    assert makers.pop().name == "Charlie"
+    assert len(makers) == 0 and "Charlie" not in makers
+
+    names = Oset(["a", "b", "c"])
+    names &= ["b", "c", "d"]
+    assert names == {"b", "c"}
+    names ^= ["c", "e"]
+    assert names == {"b", "e"}
+    assert copy.deepcopy(names) == {"b", "e"}
@@ -7,6 +7,7 @@ from omoospace import (
     is_buckup,
     is_recovered,
     is_ignore,
+    IgnoreMatcher,
 )
 
 
@@ -162,3 +163,43 @@ def test_is_ignore_windows_paths():
     assert is_ignore("content\\file.txt", ["content/*"]) == True
     assert is_ignore("sub\\content", ["content"]) == False
     assert is_ignore("\\content\\file.txt", ["/content/*"]) == True
+
+
+def test_is_ignore_directory_type():
+    """测试已知路径类型时的目录专用模式"""
+    assert is_ignore("content", ["content/"], is_dir=True) == True
+    assert is_ignore("content", ["content/"], is_dir=False) == False
+    assert is_ignore("content/file.txt", ["content/"], is_dir=False) == True
+
+
+def test_is_ignore_negation():
+    """测试取反模式"""
+    ignore_patterns = ["*.log", "!keep.log", "temp", "!temp/keep.log"]
+    assert is_ignore("file.log", ignore_patterns) == True
+    assert is_ignore("keep.log", ignore_patterns) == False
+    assert is_ignore("sub/keep.log", ignore_patterns) == True
+    # 父目录被忽略时无法重新包含
+    assert is_ignore("temp/keep.log", ignore_patterns) == True
+
+
+def test_is_ignore_any_level():
+    """测试 ** 模式"""
+    assert is_ignore("cache", ["**/cache"]) == True
+    assert is_ignore("sub/cache", ["**/cache"]) == True
+    assert is_ignore("sub/cache/file.txt", ["**/cache"]) == True
+    assert is_ignore("sub/mycache", ["**/cache"]) == False
+    assert is_ignore("a/b/c.txt", ["a/**/c.txt"]) == True
+    assert is_ignore("a/c.txt", ["a/**/c.txt"]) == True
+
+
+def test_ignore_matcher():
+    """测试预编译匹配器"""
+    matcher = IgnoreMatcher(["# comment", "", "Temp/", "*.bak", "!Keep.bak"])
+    assert matcher.match("Temp") == True
+    assert matcher.match("Temp", is_dir=False) == False
+    assert matcher.match("Prop01/Prop01.bak") == True
+    assert matcher.match("Keep.bak") == False
+    assert matcher.match_entry("Temp/Prop01.blend") == False
+    assert matcher.match("Temp/Prop01.blend") == True
+    assert not IgnoreMatcher([])
+    assert IgnoreMatcher([]).match("Temp") == False